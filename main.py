@@ -40,7 +40,10 @@ def main():
         analyzer = IrelandDataAnalyzer()
         dashboard = DashboardVisualizer()
         
-        datasets = data_collector.collect_all_datasets()
+        try:
+            datasets = data_collector.collect_all_datasets()
+        finally:
+            data_collector.close()
         db_manager.store_datasets(datasets)
         
         processed_data = processor.process_all_data(db_manager)
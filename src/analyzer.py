@@ -233,21 +233,18 @@ class IrelandDataAnalyzer:
             pollution_cols = [col for col in available_columns if 'pollution' in col.lower() or 'emission' in col.lower()]
             water_cols = [col for col in available_columns if 'quality' in col.lower() or 'percent' in col.lower()]
             
+            # Sub-matrices are sliced from the overall matrix (pairwise-complete Pearson is identical on a column subset)
             # Pollution-water correlation with estimated emissions
             if pollution_cols and water_cols:
-                pw_cols = [col for col in pollution_cols + water_cols if col in df_with_growth.columns]
-                if pw_cols:
-                    pollution_water_corr = df_with_growth[pw_cols].corr()
-                    correlations['pollution_water'] = pollution_water_corr
+                pw_cols = pollution_cols + water_cols
+                correlations['pollution_water'] = corr_matrix.loc[pw_cols, pw_cols]
             
             pop_cols = [col for col in available_columns if 'population' in col.lower()]
             env_cols = pollution_cols + water_cols
             
             if pop_cols and env_cols:
-                pe_cols = [col for col in pop_cols + env_cols if col in df_with_growth.columns]
-                if pe_cols:
-                    pop_env_corr = df_with_growth[pe_cols].corr()
-                    correlations['population_environment'] = pop_env_corr
+                pe_cols = pop_cols + env_cols
+                correlations['population_environment'] = corr_matrix.loc[pe_cols, pe_cols]
         
         return correlations
     
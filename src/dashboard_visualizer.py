@@ -12,12 +12,76 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import logging
+import string
+from functools import lru_cache
 from pathlib import Path
 from src.analysis_results import AnalysisResults
 
+
+class _PlaceholderTemplate(string.Template):
+    """string.Template matching the {{NAME}} placeholders used by the HTML templates"""
+    delimiter = '{{'
+    pattern = r'''
+        \{\{(?:
+            (?P<escaped>(?!))          |
+            (?P<named>[A-Z_]+)\}\}     |
+            (?P<braced>(?!))           |
+            (?P<invalid>(?!))
+        )
+    '''
+
+
+def _load_template(path: str) -> Optional[_PlaceholderTemplate]:
+    """Compiled template for a file, None if it does not exist; recompiled when the file changes"""
+    template_path = Path(path).resolve()
+    try:
+        mtime_ns = template_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return _compile_template(template_path, mtime_ns)
+
+
+@lru_cache(maxsize=32)
+def _compile_template(template_path: Path, mtime_ns: int) -> _PlaceholderTemplate:
+    """Read and compile a template file, cached per (absolute path, modification time)"""
+    with open(template_path, 'r', encoding='utf-8') as f:
+        return _PlaceholderTemplate(f.read())
+
+
+_FALLBACK_CARD_TEMPLATE = _PlaceholderTemplate("""<div class="insight-card">
+    <h3>{{TITLE}}</h3>
+    <div class="insight-card-content">
+        {{CONTENT}}
+    </div>
+</div>""")
+
+_FALLBACK_DASHBOARD_TEMPLATE = _PlaceholderTemplate("""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>Ireland Environmental Analysis Dashboard</title>
+</head>
+<body>
+    <h1>Ireland Environmental Analysis Dashboard</h1>
+    {{INSIGHTS_SECTION}}
+    {{PLOTLY_CHART}}
+</body>
+</html>""")
+
+
 class DashboardVisualizer:
+    
+    # Plotted columns and the narrower dtype they are serialised with (float32/int32 halve the trace payload)
+    PLOT_DTYPES = {
+        'avg_quality_score': 'float32',
+        'pollution_index': 'float32',
+        'estimated_county_emissions': 'float32',
+        'population': 'int32',
+        'total_national_population': 'int32'
+    }
+    
     def __init__(self, output_dir='output', template_path='templates/dashboard.html'):
         self.output_dir = output_dir
         self.template_path = template_path
@@ -57,10 +121,42 @@ class DashboardVisualizer:
         self._print_dashboard_summary(analysis_dict)
     
     def _prepare_analysis_data(self, analysis_results: AnalysisResults | Dict[str, Any]) -> Dict[str, Any]:
-        """Convert analysis results to dictionary format"""
+        """Convert analysis results to dictionary format with plot-ready dtypes"""
         if isinstance(analysis_results, AnalysisResults):
-            return analysis_results.to_dict()
-        return analysis_results
+            analysis_dict = analysis_results.to_dict()
+        else:
+            analysis_dict = dict(analysis_results)
+        
+        analysis_dict['correlations'] = self._clean_correlation_matrices(analysis_dict.get('correlations', {}))
+        
+        # Downcast on copies so the caller's frames (later stored in the database) keep full precision
+        analysis_dict['processed_data'] = {
+            name: self._downcast_plot_columns(df) if isinstance(df, pd.DataFrame) else df
+            for name, df in analysis_dict['processed_data'].items()
+        }
+        return analysis_dict
+    
+    def _clean_correlation_matrices(self, correlations: Dict[str, Any]) -> Dict[str, Any]:
+        """Drop all-NaN rows/columns once so every correlation widget reuses the same cleaned matrix"""
+        return {
+            name: corr.dropna(how='all', axis=0).dropna(how='all', axis=1) if isinstance(corr, pd.DataFrame) else corr
+            for name, corr in correlations.items()
+        }
+    
+    def _downcast_plot_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Cast plotted numeric columns to 32-bit types before they are passed to Plotly traces"""
+        columns = [col for col in self.PLOT_DTYPES if col in df.columns and pd.api.types.is_numeric_dtype(df[col])]
+        if not columns:
+            return df
+        
+        df = df.copy()
+        for col in columns:
+            dtype = self.PLOT_DTYPES[col]
+            # Integer columns with gaps (e.g. missing population) cannot hold NaN
+            if dtype == 'int32' and df[col].isna().any():
+                dtype = 'float32'
+            df[col] = df[col].astype(dtype)
+        return df
     
     def _create_subplot_structure(self) -> go.Figure:
         """Create the subplot structure for the dashboard"""
@@ -183,21 +279,20 @@ class DashboardVisualizer:
         # Widget 9: Pollution-Water Correlation (Heatmap)
         if 'pollution_water' in correlations and not correlations['pollution_water'].empty:
             pw_corr = correlations['pollution_water']
-            pw_corr = pw_corr.dropna(how='all', axis=0).dropna(how='all', axis=1)
-            if not pw_corr.empty:
-                fig.add_trace(
-                    go.Heatmap(
-                        z=pw_corr.values,
-                        x=pw_corr.columns,
-                        y=pw_corr.index,
-                        colorscale='RdBu',
-                        zmid=0,
-                        text=np.round(pw_corr.values, 2),
-                        texttemplate='%{text}',
-                        showscale=False
-                    ),
-                    row=5, col=1
-                )
+            pw_values = pw_corr.to_numpy(copy=False)
+            fig.add_trace(
+                go.Heatmap(
+                    z=pw_values,
+                    x=pw_corr.columns,
+                    y=pw_corr.index,
+                    colorscale='RdBu',
+                    zmid=0,
+                    text=np.round(pw_values, 2),
+                    texttemplate='%{text}',
+                    showscale=False
+                ),
+                row=5, col=1
+            )
         
         # Widget 10: Estimated County Emissions vs Water Quality
         self._add_widget_10_emissions_vs_water(fig, integrated_df)
@@ -362,18 +457,30 @@ class DashboardVisualizer:
         # Widget 11: Population vs Water Quality (2022)
         df_2022 = integrated_df[integrated_df['year'] == 2022].copy()
         if len(df_2022) > 0:
+            # WebGL markers; county labels are added as layout annotations instead of SVG text traces
             fig.add_trace(
-                go.Scatter(
+                go.Scattergl(
                     x=df_2022['population'],
                     y=df_2022['avg_quality_score'],
-                    mode='markers+text',
+                    mode='markers',
                     text=df_2022['county'],
-                    textposition='top center',
                     marker=dict(size=12, color='purple'),
                     showlegend=False
                 ),
                 row=6, col=1
             )
+            
+            labelled = df_2022.dropna(subset=['population', 'avg_quality_score'])
+            county_labels = tuple(
+                go.layout.Annotation(
+                    x=x, y=y, text=county,
+                    xref='x11', yref='y11',
+                    yshift=12, showarrow=False,
+                    font=dict(size=9)
+                )
+                for county, x, y in zip(labelled['county'], labelled['population'], labelled['avg_quality_score'])
+            )
+            fig.update_layout(annotations=fig.layout.annotations + county_labels)
         
         # Widget 15: Population-Pollution Correlation (Census Years)
         if not pvp_df.empty and 'population' in pvp_df.columns and 'total_emissions' in pvp_df.columns:
@@ -402,57 +509,57 @@ class DashboardVisualizer:
         """Add correlation analysis widgets (12, 13)"""
         correlations = analysis_dict.get('correlations', {})
         
+        if 'overall' not in correlations or correlations['overall'].empty:
+            return
+        
+        corr_matrix = correlations['overall']
+        
         # Widget 12: Correlation Analysis (Bar chart)
-        if 'overall' in correlations and not correlations['overall'].empty:
-            corr_matrix = correlations['overall']
-            corr_pairs = []
-            corr_values = []
-            
-            if 'pollution_index' in corr_matrix.index and 'avg_quality_score' in corr_matrix.columns:
-                corr_pairs.append('Pollution vs Water Quality')
-                corr_values.append(corr_matrix.loc['pollution_index', 'avg_quality_score'])
-            
-            if 'pollution_index' in corr_matrix.index and 'total_national_population' in corr_matrix.columns:
-                corr_pairs.append('Pollution vs National Population')
-                corr_values.append(corr_matrix.loc['pollution_index', 'total_national_population'])
-            
-            if 'population' in corr_matrix.index and 'avg_quality_score' in corr_matrix.columns:
-                corr_pairs.append('Population vs Water Quality')
-                corr_values.append(corr_matrix.loc['population', 'avg_quality_score'])
-            
-            if corr_pairs:
-                colors = ['red' if v < 0 else 'green' for v in corr_values]
-                fig.add_trace(
-                    go.Bar(
-                        x=corr_values,
-                        y=corr_pairs,
-                        orientation='h',
-                        marker=dict(color=colors),
-                        text=[f'{v:.3f}' for v in corr_values],
-                        textposition='auto',
-                        showlegend=False
-                    ),
-                    row=6, col=2
-                )
+        corr_pairs = []
+        corr_values = []
+        
+        if 'pollution_index' in corr_matrix.index and 'avg_quality_score' in corr_matrix.columns:
+            corr_pairs.append('Pollution vs Water Quality')
+            corr_values.append(corr_matrix.loc['pollution_index', 'avg_quality_score'])
+        
+        if 'pollution_index' in corr_matrix.index and 'total_national_population' in corr_matrix.columns:
+            corr_pairs.append('Pollution vs National Population')
+            corr_values.append(corr_matrix.loc['pollution_index', 'total_national_population'])
+        
+        if 'population' in corr_matrix.index and 'avg_quality_score' in corr_matrix.columns:
+            corr_pairs.append('Population vs Water Quality')
+            corr_values.append(corr_matrix.loc['population', 'avg_quality_score'])
+        
+        if corr_pairs:
+            colors = ['red' if v < 0 else 'green' for v in corr_values]
+            fig.add_trace(
+                go.Bar(
+                    x=corr_values,
+                    y=corr_pairs,
+                    orientation='h',
+                    marker=dict(color=colors),
+                    text=[f'{v:.3f}' for v in corr_values],
+                    textposition='auto',
+                    showlegend=False
+                ),
+                row=6, col=2
+            )
         
         # Widget 13: Overall Correlation Matrix (Heatmap)
-        if 'overall' in correlations and not correlations['overall'].empty:
-            corr_matrix = correlations['overall']
-            corr_matrix = corr_matrix.dropna(how='all', axis=0).dropna(how='all', axis=1)
-            if not corr_matrix.empty:
-                fig.add_trace(
-                    go.Heatmap(
-                        z=corr_matrix.values,
-                        x=corr_matrix.columns,
-                        y=corr_matrix.index,
-                        colorscale='RdBu',
-                        zmid=0,
-                        text=np.round(corr_matrix.values, 2),
-                        texttemplate='%{text}',
-                        showscale=False
-                    ),
-                    row=7, col=1
-                )
+        overall_values = corr_matrix.to_numpy(copy=False)
+        fig.add_trace(
+            go.Heatmap(
+                z=overall_values,
+                x=corr_matrix.columns,
+                y=corr_matrix.index,
+                colorscale='RdBu',
+                zmid=0,
+                text=np.round(overall_values, 2),
+                texttemplate='%{text}',
+                showscale=False
+            ),
+            row=7, col=1
+        )
     
     def _add_summary_widgets(self, fig: go.Figure, analysis_dict: Dict[str, Any]) -> None:
         """Add summary and data quality widgets (16, 17, 18)"""
@@ -539,15 +646,20 @@ class DashboardVisualizer:
         )
         
         # Widget 18: Data Quality & Coverage
+        row_complete = integrated_df.notna().all(axis=1)
+        complete_records = int(row_complete.sum())
+        counties_full = row_complete.groupby(integrated_df['county'], sort=False).all().sum()
+        years_full = row_complete.groupby(integrated_df['year'], sort=False).all().sum()
+        
         quality_data = [
             ['Total Records', str(len(integrated_df))],
             ['Missing Pollution Data', str(integrated_df['pollution_index'].isna().sum())],
             ['Missing Water Quality Data', str(integrated_df['avg_quality_score'].isna().sum())],
             ['Missing Population Data', str(integrated_df['population'].isna().sum())],
-            ['Complete Records', str(integrated_df.dropna().shape[0])],
-            ['Data Completeness', f"{(integrated_df.dropna().shape[0]/len(integrated_df)*100):.1f}%"],
-            ['Counties with Full Data', str(integrated_df.groupby('county', group_keys=False).apply(lambda x: x.dropna().shape[0] == len(x), include_groups=False).sum())],
-            ['Years with Full Data', str(integrated_df.groupby('year', group_keys=False).apply(lambda x: x.dropna().shape[0] == len(x), include_groups=False).sum())]
+            ['Complete Records', str(complete_records)],
+            ['Data Completeness', f"{(complete_records/len(integrated_df)*100):.1f}%"],
+            ['Counties with Full Data', str(counties_full)],
+            ['Years with Full Data', str(years_full)]
         ]
         
         fig.add_trace(
@@ -646,19 +758,15 @@ class DashboardVisualizer:
         insights_html = self._create_analysis_insights_section(pvp_analysis, pvw_analysis, analysis_dict)
         
         # Load template
-        template_path = Path(self.template_path)
-        if not template_path.exists():
-            self.logger.warning(f"Template not found at {template_path}, using fallback")
-            template_content = self._get_fallback_template()
-        else:
-            with open(template_path, 'r', encoding='utf-8') as f:
-                template_content = f.read()
+        template = _load_template(self.template_path)
+        if template is None:
+            self.logger.warning(f"Template not found at {self.template_path}, using fallback")
+            template = self._get_fallback_template()
         
         # Generate Plotly chart HTML (div only, no full page)
         plotly_div = fig.to_html(include_plotlyjs='cdn', div_id='plotly-chart', full_html=False)
         
-        html_content = template_content.replace('{{INSIGHTS_SECTION}}', insights_html)
-        html_content = html_content.replace('{{PLOTLY_CHART}}', plotly_div)
+        html_content = template.safe_substitute(INSIGHTS_SECTION=insights_html, PLOTLY_CHART=plotly_div)
         
         # Write final HTML
         output_path = f'{self.output_dir}/comprehensive_dashboard.html'
@@ -699,28 +807,27 @@ class DashboardVisualizer:
         # Load insight card template
         card_template = self._load_insight_card_template()
         
-        insights_html = '<div class="insights-section">'
-        insights_html += '<h2>Multi-Dataset Integration Results</h2>'
-        insights_html += '<p>Statistical analysis across census periods (2011, 2016, 2022) and water quality monitoring (2021-2024)</p>'
+        parts = [
+            '<div class="insights-section">',
+            '<h2>Multi-Dataset Integration Results</h2>',
+            '<p>Statistical analysis across census periods (2011, 2016, 2022) and water quality monitoring (2021-2024)</p>'
+        ]
 
         # Analysis 1: Population-Emissions
         if pvp_analysis:
             content = self._build_pvp_content(pvp_analysis)
-            insights_html += card_template.replace('{{TITLE}}', 'Analysis 1: Emissions-Demographics Relationship (Census Periods)')
-            insights_html = insights_html.replace('{{CONTENT}}', content)
+            parts.append(self._render_insight_card(card_template, 'Analysis 1: Emissions-Demographics Relationship (Census Periods)', content))
 
         # Analysis 2: Emissions-Water Quality
         if pvw_analysis:
             content = self._build_pvw_content(pvw_analysis)
-            insights_html += card_template.replace('{{TITLE}}', 'Analysis 2: Emissions-Water Quality Relationship')
-            insights_html = insights_html.replace('{{CONTENT}}', content)
+            parts.append(self._render_insight_card(card_template, 'Analysis 2: Emissions-Water Quality Relationship', content))
 
         # Analysis 3: National Growth Correlation (2011-2022)
         national_growth_analysis = self._calculate_national_period_growth_correlation(analysis_dict)
         if national_growth_analysis:
             content = self._build_national_growth_content(national_growth_analysis)
-            insights_html += card_template.replace('{{TITLE}}', 'Analysis 3: National Population vs Emission Growth (2011-2022)')
-            insights_html = insights_html.replace('{{CONTENT}}', content)
+            parts.append(self._render_insight_card(card_template, 'Analysis 3: National Population vs Emission Growth (2011-2022)', content))
         
         # Analysis 4: Integrated Dataset
         content = """
@@ -728,12 +835,15 @@ class DashboardVisualizer:
             <p><strong>Temporal Scope:</strong> Water quality observation period (2021-2024) with 2022 census baseline propagated to non-census years.</p>
             <p><strong>Analytical Purpose:</strong> Facilitates county-level assessment of water quality temporal patterns within demographic context.</p>
         """
-        insights_html += card_template.replace('{{TITLE}}', 'Analysis 4: Integrated Water Quality-Demographics Dataset')
-        insights_html = insights_html.replace('{{CONTENT}}', content)
+        parts.append(self._render_insight_card(card_template, 'Analysis 4: Integrated Water Quality-Demographics Dataset', content))
         
-        insights_html += '</div>'
+        parts.append('</div>')
         
-        return insights_html
+        return ''.join(parts)
+
+    def _render_insight_card(self, card_template: _PlaceholderTemplate, title: str, content: str) -> str:
+        """Fill the insight card template with a title and HTML content"""
+        return card_template.safe_substitute(TITLE=title, CONTENT=content)
 
     def _build_pvw_content(self, pvw_analysis: Dict[str, Any]) -> str:
         """Build content for pollution vs water analysis"""
@@ -795,8 +905,10 @@ class DashboardVisualizer:
             top_counties = pvp_analysis['top_growing_counties']
             content_parts.append("<p><strong>Highest Population Growth Rates (Top 5 Counties):</strong></p>")
             content_parts.append("<ul style='margin: 5px 0 0 20px;'>")
-            for county in top_counties[:5]:
-                content_parts.append(f"<li>{county['county']}: +{county['population_change_pct']:.1f}% intercensal change</li>")
+            content_parts.append('\n'.join(
+                f"<li>{county['county']}: +{county['population_change_pct']:.1f}% intercensal change</li>"
+                for county in top_counties[:5]
+            ))
             content_parts.append("</ul>")
 
         return '\n'.join(content_parts)
@@ -894,32 +1006,14 @@ class DashboardVisualizer:
         
         return '\n'.join(content_parts)
 
-    def _load_insight_card_template(self) -> str:
+    def _load_insight_card_template(self) -> _PlaceholderTemplate:
         """Load insight card template"""
-        card_template_path = Path('templates/insight_card.html')
-        if card_template_path.exists():
-            with open(card_template_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        else:
-            # Fallback template
-            return """<div class="insight-card">
-    <h3>{{TITLE}}</h3>
-    <div class="insight-card-content">
-        {{CONTENT}}
-    </div>
-</div>"""
+        card_template = _load_template('templates/insight_card.html')
+        if card_template is not None:
+            return card_template
+        # Fallback template
+        return _FALLBACK_CARD_TEMPLATE
 
-    def _get_fallback_template(self) -> str:
+    def _get_fallback_template(self) -> _PlaceholderTemplate:
         """Fallback template if template file is not found"""
-        return """<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <title>Ireland Environmental Analysis Dashboard</title>
-</head>
-<body>
-    <h1>Ireland Environmental Analysis Dashboard</h1>
-    {{INSIGHTS_SECTION}}
-    {{PLOTLY_CHART}}
-</body>
-</html>"""
+        return _FALLBACK_DASHBOARD_TEMPLATE
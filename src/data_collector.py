@@ -4,35 +4,102 @@ Collects Irish government data for environmental-demographic analysis
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
+import numpy as np
 import json
 import logging
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import io
+import os
+import glob
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from src.constants import IrishCounties
 from src.fallback_data_generator import FallbackDataGenerator
 
+try:
+    import pyarrow  # noqa: F401 - enables pandas' multi-threaded Arrow CSV reader and the feather frame cache
+    _HAS_PYARROW = True
+except ImportError:
+    _HAS_PYARROW = False
+_CSV_ENGINE = 'pyarrow' if _HAS_PYARROW else 'c'
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 
 class DataCollector:
     """Collects pollution, water quality, and population data from Irish government sources"""
     
-    def __init__(self):
+    # Column dtypes for the EPA02 CSV export; low-cardinality labels as categories, measures at full precision
+    WATER_QUALITY_CSV_DTYPES = MappingProxyType({
+        'County': 'category',
+        'Classification': 'category',
+        'Statistic Label': 'category',
+        'VALUE': 'float64',
+        'Value': 'float64'
+    })
+    
+    # CSO column name -> normalized column name
+    COLUMN_ALIASES = MappingProxyType({
+        'County': 'county',
+        'Year': 'year',
+        'Pollutant': 'pollutant',
+        'Value': 'value',
+        'Classification': 'classification',
+        'Population': 'population'
+    })
+    
+    # Census population columns in record order, with their dtypes
+    POPULATION_DTYPES = MappingProxyType({
+        'county': 'category',
+        'year': 'int16',
+        'census_year': 'int16',
+        'population': 'int64',
+        'statistic': 'category'
+    })
+    
+    # Census year -> CSO dataset code holding its county populations
+    CENSUS_DATASETS = MappingProxyType({
+        2011: 'E2011',
+        2022: 'G0420'
+    })
+    
+    def __init__(self, cache_dir: str = "data/cso_cache"):
         self.logger = logging.getLogger(__name__)
+        self.cache_dir = cache_dir
         self.base_urls = {
             'cso': 'https://ws.cso.ie/public/api.restful/PxStat.Data.Cube_API.ReadDataset',
             'epa_bathing': 'https://epawebapp.epa.ie/bathingwater/api',
             'data_gov': 'https://data.gov.ie/api/3/action'
         }
         self._fallback_generator: Optional[FallbackDataGenerator] = None
+        self._fallback_lock = threading.Lock()
+        self._session = self._create_session()
         
     def collect_all_datasets(self) -> Dict[str, pd.DataFrame]:
-        """Collect all required datasets for pollution-water-population analysis"""
+        """
+        Collect all required datasets for pollution-water-population analysis
+        The collectors are I/O-bound, so they run concurrently and total time is the slowest fetch
+        """
+        collectors = {
+            'raw_pollution': self._collect_pollution_data,
+            'raw_water_quality': self._collect_water_quality_data,
+            'raw_population': self._collect_population_data
+        }
+        
         try:
-            datasets = {
-                'raw_pollution': self._collect_pollution_data(),
-                'raw_water_quality': self._collect_water_quality_data(),
-                'raw_population': self._collect_population_data()
-            }
+            with ThreadPoolExecutor(max_workers=len(collectors)) as executor:
+                futures = {name: executor.submit(collector) for name, collector in collectors.items()}
+                datasets = {name: future.result() for name, future in futures.items()}
             return datasets
             
         except Exception as e:
@@ -46,20 +113,16 @@ class DataCollector:
         """
         try:
             url = f"{self.base_urls['cso']}/EAA20/JSON-stat/2.0/en"
-            response = requests.get(url, timeout=30)
+            body = self._cached_get(url, timeout=30)
             
-            if response.status_code == 200:
-                data = response.json()
+            if body is not None:
+                df = self._parse_cso_body(body, 'pollution')
                 
-                records = self._parse_cso_jsonstat(data, 'pollution')
-                
-                if records and len(records) > 0:
-                    df = pd.DataFrame(records)
-                    
+                if not df.empty:
                     df['geographic_level'] = 'National'
                     df['county'] = 'Ireland'
                     
-                    return self._normalize_pollution_columns(df)
+                    return df
             
             self.logger.warning("Could not parse CSO pollution data, using fallback")
             
@@ -76,25 +139,20 @@ class DataCollector:
         try:
             url = f"{self.base_urls['cso']}/EPA02/JSON-stat/2.0/en"
             
-            response = requests.get(url, timeout=60)
+            body = self._cached_get(url, timeout=60)
             
-            if response.status_code == 200:
-                data = response.json()
+            if body is not None:
+                df = self._parse_cso_body(body, 'water_quality')
                 
-                if 'dimension' in data and 'value' in data:
-                    records = self._parse_cso_jsonstat(data, 'water_quality')
-                    
-                    if records:
-                        df = pd.DataFrame(records)
-                        df = self._normalize_water_quality_columns(df)
-                        return df
+                if not df.empty:
+                    return df
             
             csv_url = f"{self.base_urls['cso']}/EPA02/CSV/1.0/en"
-            response = requests.get(csv_url, timeout=60)
+            body = self._cached_get(csv_url, timeout=60)
             
-            if response.status_code == 200:
-                df = pd.read_csv(io.StringIO(response.text))
-                df = self._normalize_water_quality_columns(df)
+            if body is not None:
+                df = pd.read_csv(io.BytesIO(body), dtype=dict(self.WATER_QUALITY_CSV_DTYPES), engine=_CSV_ENGINE)
+                df = self._normalize_columns(df)
                 return df
             
             self.logger.warning("No water quality data available from CSO, using fallback")
@@ -108,153 +166,314 @@ class DataCollector:
         """
         Collect population by county data from CSO Ireland census datasets
         """
-        all_population_data = []
+        census_datasets = self.CENSUS_DATASETS
         
-        census_datasets = {
-            2011: 'E2011',
-            2022: 'G0420'
-        }
-
-        self._process_2016_data_from_2011_dataset(all_population_data)
+        # Fetch each census cube once, concurrently; the 2011 cube also carries the 2016 national total
+        with ThreadPoolExecutor(max_workers=len(census_datasets)) as executor:
+            cubes = dict(zip(census_datasets, executor.map(self._fetch_census_cube, census_datasets.values())))
         
-        for year, dataset_code in census_datasets.items():
-            try:
-                url = f"{self.base_urls['cso']}/{dataset_code}/JSON-stat/2.0/en"
-                
-                response = requests.get(url, timeout=60)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    if 'dimension' in data and 'value' in data:
-
-                        county_records = self._extract_county_population_data(data, year)
-                        
-                        if county_records:
-                            df = pd.DataFrame(county_records)
-                            all_population_data.append(df)
-                        else:
-                            self.logger.warning(f"No county records found in {year} census")
-                    else:
-                        self.logger.warning(f"Invalid data format from {year} Census")
-                else:
-                    self.logger.warning(f"Failed to fetch {year} Census (status {response.status_code})")
-                    
-            except Exception as e:
-                self.logger.error(f"Error collecting {year} Census data: {str(e)}")
+        all_records = self._process_2016_data_from_2011_dataset(cubes[2011])
+        for year in census_datasets:
+            all_records.extend(self._extract_census_year_data(year, cubes[year]))
         
-        if all_population_data:
-            combined_df = pd.concat(all_population_data, ignore_index=True)
-            return combined_df
+        if all_records:
+            combined_df = pd.DataFrame.from_records(all_records, columns=list(self.POPULATION_DTYPES))
+            return combined_df.astype(dict(self.POPULATION_DTYPES))
         else:
             self.logger.warning("No census data collected, using fallback")
             return self._get_fallback_generator().generate_population_data([2011, 2016, 2022])
-
-    def _process_2016_data_from_2011_dataset(self, all_population_data):
+    
+    def _fetch_census_cube(self, dataset_code: str) -> Optional[dict]:
+        """Fetch and decode a census JSON-stat cube, None if it is unavailable or malformed"""
         try:
-            url = f"{self.base_urls['cso']}/E2011/JSON-stat/2.0/en"
-            response = requests.get(url, timeout=60)
-
-            if response.status_code == 200:
-                data = response.json()
+            url = f"{self.base_urls['cso']}/{dataset_code}/JSON-stat/2.0/en"
+            
+            body = self._cached_get(url, timeout=60)
+            
+            if body is not None:
+                data = _json_loads(body)
+                
                 if 'dimension' in data and 'value' in data:
-                    # Extract 2016 national total only
-                    ireland_2016_record = self._extract_national_total_2016(data, 'E2011')
-                    if ireland_2016_record:
-                        df_2016 = pd.DataFrame([ireland_2016_record])
-                        all_population_data.append(df_2016)
-                        self.logger.info(
-                            f"Extracted 2016 Ireland national total: {ireland_2016_record['population']:,}")
+                    # Keep the cube's cells as one float64 vector (NaN for nulls) instead of a list of Python objects
+                    data['value'] = self._jsonstat_values(data['value'])
+                    return data
+                self.logger.warning(f"Invalid data format from census dataset {dataset_code}")
+            else:
+                self.logger.warning(f"Failed to fetch census dataset {dataset_code}")
+                
         except Exception as e:
-            self.logger.warning(f"Could not extract 2016 national total: {str(e)}")
+            self.logger.error(f"Error collecting census dataset {dataset_code}: {str(e)}")
+        
+        return None
+    
+    def _extract_census_year_data(self, year: int, data: Optional[dict]) -> List[Dict]:
+        """Extract the county-level population records of a single census year"""
+        if data is None:
+            return []
+        
+        county_records = self._extract_county_population_data(data, year)
+        
+        if not county_records:
+            self.logger.warning(f"No county records found in {year} census")
+        return county_records
 
-    def _parse_cso_jsonstat(self, data: dict, dataset_type: str) -> List[Dict]:
-        """Parse CSO JSON-stat 2.0 format data"""
-        records = []
+    def _process_2016_data_from_2011_dataset(self, data: Optional[dict]) -> List[Dict]:
+        if data is None:
+            return []
+        
+        # Extract 2016 national total only
+        ireland_2016_record = self._extract_national_total_2016(data, 'E2011')
+        if ireland_2016_record:
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("Extracted 2016 Ireland national total: %s", f"{ireland_2016_record['population']:,}")
+            return [ireland_2016_record]
+        
+        return []
+
+    def _create_session(self) -> requests.Session:
+        """
+        HTTP session shared by all collectors
+        Keeps connections to the CSO API alive across requests and retries transient server errors
+        """
+        retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504], raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+        
+        session = requests.Session()
+        session.headers.update({'Accept-Encoding': 'gzip, deflate', 'Connection': 'keep-alive'})
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+    
+    def close(self) -> None:
+        """Close pooled HTTP connections"""
+        self._session.close()
+    
+    def _cached_get(self, url: str, timeout: int) -> Optional[bytes]:
+        """
+        Fetch a resource through the on-disk response cache
+        Cached URLs are revalidated with If-None-Match/If-Modified-Since and served from disk on HTTP 304,
+        or as a stale copy when the server cannot be reached or answers with an error
+        Returns the response body, or None if the request did not succeed
+        """
+        cache_path = self._cache_path(url)
+        cached = self._read_cache(cache_path)
+        
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+        
+        try:
+            response = self._session.get(url, timeout=timeout, headers=headers)
+        except requests.RequestException as e:
+            if not cached:
+                raise
+            self.logger.warning(f"Request to {url} failed ({str(e)}), serving stale cached response")
+            return cached['body']
+        
+        if response.status_code == 304 and cached:
+            self.logger.info("Using cached response for %s (not modified)", url)
+            return cached['body']
+        
+        if response.status_code != 200:
+            if cached:
+                self.logger.warning(f"Request to {url} failed (status {response.status_code}), serving stale cached response")
+                return cached['body']
+            self.logger.warning(f"Request to {url} failed (status {response.status_code})")
+            return None
+        
+        self._write_cache(cache_path, {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'body': response.content
+        })
+        return response.content
+    
+    def _cache_path(self, url: str) -> str:
+        """Base path of the cache entry for a URL; the body and its validators are stored beside it"""
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode('utf-8')).hexdigest())
+    
+    def _read_cache(self, cache_path: str) -> Optional[Dict[str, Any]]:
+        """Load a cached response body with its ETag/Last-Modified validators, ignoring missing or unreadable files"""
+        try:
+            with open(f"{cache_path}.json", 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            with open(f"{cache_path}.body", 'rb') as f:
+                entry['body'] = f.read()
+            return entry
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable cache entry {cache_path}: {str(e)}")
+            return None
+    
+    def _write_cache(self, cache_path: str, entry: Dict[str, Any]) -> None:
+        """Persist a response body as a plain file and its validators in a JSON sidecar"""
+        if not entry['etag'] and not entry['last_modified']:
+            return
+        
+        # Body first: a sidecar left from an older response then names validators that no longer match
+        body = entry['body']
+        if self._write_atomic(f"{cache_path}.body", lambda f: f.write(body)):
+            validators = json.dumps({'etag': entry['etag'], 'last_modified': entry['last_modified']})
+            self._write_atomic(f"{cache_path}.json", lambda f: f.write(validators.encode('utf-8')))
+    
+    def _write_atomic(self, path: str, write) -> bool:
+        """
+        Write a cache file through write(file) into a temporary file, then move it into place
+        Concurrent fetches never see partial data; returns False (after logging) if the write failed
+        """
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                write(f)
+            os.replace(tmp_path, path)
+            return True
+        except Exception as e:
+            self.logger.warning(f"Could not write cache entry {path}: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+    
+    def _parse_cso_body(self, body: bytes, dataset_type: str) -> pd.DataFrame:
+        """
+        Decode and parse a JSON-stat response body
+        With pyarrow installed, the latest parsed frame of each dataset type is kept as feather under
+        a digest of its body, so an unchanged dataset is only parsed once
+        """
+        if not _HAS_PYARROW:
+            return self._parse_cso_jsonstat(_json_loads(body), dataset_type)
+        
+        frame_path = self._frame_path(dataset_type, hashlib.sha256(body).hexdigest())
+        df = self._read_frame(frame_path)
+        if df is not None:
+            return df
         
+        df = self._parse_cso_jsonstat(_json_loads(body), dataset_type)
+        if not df.empty:
+            self._write_frame(frame_path, df, dataset_type)
+        return df
+    
+    def _frame_path(self, dataset_type: str, digest: str) -> str:
+        """Path of the parsed frame cached for a dataset type and response body digest"""
+        return os.path.join(self.cache_dir, f"{dataset_type}.{digest}.frame.feather")
+    
+    def _read_frame(self, frame_path: str) -> Optional[pd.DataFrame]:
+        """Load a cached parsed frame, ignoring missing or unreadable files"""
+        try:
+            return pd.read_feather(frame_path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable cache entry {frame_path}: {str(e)}")
+            return None
+    
+    def _write_frame(self, frame_path: str, df: pd.DataFrame, dataset_type: str) -> None:
+        """Store a parsed frame and drop the frames cached for earlier bodies of the same dataset type"""
+        if not self._write_atomic(frame_path, df.to_feather):
+            return
+        
+        for stale_path in glob.glob(self._frame_path(dataset_type, '*')):
+            if stale_path != frame_path:
+                try:
+                    os.remove(stale_path)
+                except OSError as e:
+                    self.logger.warning(f"Could not remove stale cache entry {stale_path}: {str(e)}")
+    
+    def _parse_cso_jsonstat(self, data: dict, dataset_type: str) -> pd.DataFrame:
+        """
+        Parse CSO JSON-stat 2.0 format data into a DataFrame
+        Builds one column per dimension directly from the flat row-major value array
+        """
         try:
             dimensions = data.get('dimension', {})
             values = data.get('value', [])
             
-            dim_info = {}
-            dim_sizes = []
             dim_names = []
+            dim_labels = []
             
             for dim_id, dim_data in dimensions.items():
                 if 'category' in dim_data:
-                    labels = list(dim_data['category'].get('label', {}).values())
-                    dim_info[dim_id] = labels
-                    dim_sizes.append(len(labels))
                     dim_names.append(dim_id)
+                    dim_labels.append(np.asarray(list(dim_data['category'].get('label', {}).values()), dtype=object))
             
-            if dim_sizes and values:
-                import itertools
-                
-                dim_values = [dim_info[name] for name in dim_names]
-                
-                for idx, combination in enumerate(itertools.product(*dim_values)):
-                    if idx < len(values) and values[idx] is not None:
-                        record = {}
-                        
-                        for dim_name, dim_value in zip(dim_names, combination):
-                            if 'tlist' in dim_name.lower() or 'year' in dim_name.lower():
-                                record['year'] = dim_value
-                            elif 'statistic' in dim_name.lower():
-                                record['statistic'] = dim_value
-                            else:
-                                if dataset_type == 'pollution':
-                                    record['pollutant'] = dim_value
-                                elif dataset_type == 'water_quality':
-                                    record['county'] = dim_value
-                                elif dataset_type == 'population':
-                                    record['county'] = dim_value
-                                else:
-                                    record['category'] = dim_value
-                        
-                        record['value'] = values[idx]
-                        records.append(record)
+            if not dim_names or len(values) == 0:
+                return pd.DataFrame()
+            
+            dim_sizes = [len(labels) for labels in dim_labels]
+            n_cells = min(int(np.prod(dim_sizes)), len(values))
+            
+            value_col = self._jsonstat_values(values[:n_cells])
+            cell_idx = np.flatnonzero(~np.isnan(value_col))
+            
+            strides = self._jsonstat_strides(dim_sizes)
+            
+            columns = {}
+            for dim_name, labels, size, stride in zip(dim_names, dim_labels, dim_sizes, strides):
+                column_name = self._jsonstat_column_name(dim_name, dataset_type)
+                columns[column_name] = self._jsonstat_typed_column(column_name, labels, (cell_idx // stride) % size)
+            
+            columns['value'] = value_col[cell_idx]
+            # Columns are freshly built arrays, so wrap them without another copy
+            return pd.DataFrame(columns, copy=False)
         
         except Exception as e:
             self.logger.warning(f"Error parsing JSON-stat data: {str(e)}")
-        
-        return records
+            return pd.DataFrame()
     
-    def _normalize_pollution_columns(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Normalize pollution data column names"""
-        if 'county' not in df.columns and 'County' in df.columns:
-            df.rename(columns={'County': 'county'}, inplace=True)
-        if 'year' not in df.columns and 'Year' in df.columns:
-            df.rename(columns={'Year': 'year'}, inplace=True)
-        if 'pollutant' not in df.columns and 'Pollutant' in df.columns:
-            df.rename(columns={'Pollutant': 'pollutant'}, inplace=True)
-        if 'value' not in df.columns and 'Value' in df.columns:
-            df.rename(columns={'Value': 'value'}, inplace=True)
-        
-        return df
+    def _jsonstat_values(self, values) -> np.ndarray:
+        """JSON-stat value array as float64 with NaN for null and non-numeric cells such as '..' (no-op if already converted)"""
+        if isinstance(values, np.ndarray) and values.dtype == np.float64:
+            return values
+        return pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').to_numpy(dtype=np.float64)
+    
+    def _jsonstat_strides(self, dim_sizes: List[int]) -> List[int]:
+        """Row-major strides of a JSON-stat cube: the last dimension varies fastest"""
+        return [int(stride) for stride in np.cumprod([1] + dim_sizes[:0:-1])[::-1]]
     
-    def _normalize_water_quality_columns(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Normalize water quality data column names"""
-        if 'county' not in df.columns and 'County' in df.columns:
-            df.rename(columns={'County': 'county'}, inplace=True)
-        if 'year' not in df.columns and 'Year' in df.columns:
-            df.rename(columns={'Year': 'year'}, inplace=True)
-        if 'classification' not in df.columns and 'Classification' in df.columns:
-            df.rename(columns={'Classification': 'classification'}, inplace=True)
+    def _jsonstat_column_name(self, dim_name: str, dataset_type: str) -> str:
+        """Map a JSON-stat dimension id to the column name used for the dataset type"""
+        if 'tlist' in dim_name.lower() or 'year' in dim_name.lower():
+            return 'year'
+        elif 'statistic' in dim_name.lower():
+            return 'statistic'
+        elif dataset_type == 'pollution':
+            return 'pollutant'
+        elif dataset_type in ('water_quality', 'population'):
+            return 'county'
+        return 'category'
+    
+    def _jsonstat_typed_column(self, column_name: str, labels: np.ndarray, codes: np.ndarray):
+        """
+        Build a dimension column with its final dtype from category codes
+        Years become int16 and label dimensions become categoricals sharing the dimension's label array
+        """
+        if column_name == 'year':
+            try:
+                return labels.astype(np.int16)[codes]
+            except (ValueError, OverflowError):
+                return labels[codes]
         
-        return df
+        if len(set(labels)) == len(labels):
+            return pd.Categorical.from_codes(codes, categories=labels)
+        return labels[codes]
     
-    def _normalize_population_columns(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Normalize population data column names"""
-        if 'county' not in df.columns and 'County' in df.columns:
-            df.rename(columns={'County': 'county'}, inplace=True)
-        if 'year' not in df.columns and 'Year' in df.columns:
-            df.rename(columns={'Year': 'year'}, inplace=True)
-        
-        if 'population' not in df.columns:
-            if 'value' in df.columns:
-                df.rename(columns={'value': 'population'}, inplace=True)
-            elif 'Population' in df.columns:
-                df.rename(columns={'Population': 'population'}, inplace=True)
+    def _normalize_columns(self, df: pd.DataFrame, value_as: Optional[str] = None) -> pd.DataFrame:
+        """
+        Normalize CSO column names to the lower-case names used downstream
+        
+        Args:
+            df: Raw dataset
+            value_as: Optional name for the generic 'value' column (e.g. 'population')
+        """
+        aliases = {alias: name for alias, name in self.COLUMN_ALIASES.items() if alias in df.columns and name not in df.columns}
+        df = df.rename(columns=aliases)
+        
+        if value_as and value_as not in df.columns and 'value' in df.columns:
+            df = df.rename(columns={'value': value_as})
         
         return df
     
@@ -268,7 +487,7 @@ class DataCollector:
         
         try:
             dimensions = data.get('dimension', {})
-            values = data.get('value', [])
+            values = self._jsonstat_values(data.get('value', []))
             
             # Find dimension info - different datasets have different structures
             county_dim = None
@@ -291,57 +510,64 @@ class DataCollector:
                 self.logger.warning(f"No county/area dimension found in {year} census data")
                 return records
             
-            # Get dimension categories
-            counties = list(dimensions[county_dim]['category']['label'].values())
-            sexes = list(dimensions[sex_dim]['category']['label'].values()) if sex_dim else ['Both sexes']
-            statistics = list(dimensions[statistic_dim]['category']['label'].values()) if statistic_dim else ['Population']
-            years = list(dimensions[year_dim]['category']['label'].values()) if year_dim else [str(year)]
-            
-            self.logger.info(f"{year} census: Found {len(counties)} counties, {len(statistics)} statistics")
+            if self.logger.isEnabledFor(logging.INFO):
+                n_counties = len(dimensions[county_dim]['category']['label'])
+                n_statistics = len(dimensions[statistic_dim]['category']['label']) if statistic_dim else 1
+                self.logger.info("%s census: Found %d counties, %d statistics", year, n_counties, n_statistics)
             
 
-            import itertools
-            
             dim_names = list(dimensions.keys())
-            dim_values_lists = [list(dimensions[dim_id]['category']['label'].values()) for dim_id in dim_names]
+            labels_per_dim = [list(dimensions[dim_id]['category']['label'].values()) for dim_id in dim_names]
+            dim_sizes = [len(labels) for labels in labels_per_dim]
+            strides = self._jsonstat_strides(dim_sizes)
+            n_cells = min(int(np.prod(dim_sizes)), len(values))
+            dim_pos = {dim_id: i for i, dim_id in enumerate(dim_names)}
+            year_label = str(year)
             
-            for idx, combination in enumerate(itertools.product(*dim_values_lists)):
-                if idx < len(values) and values[idx] is not None:
-                    dim_values = dict(zip(dim_names, combination))
-                    
-                    county = dim_values.get(county_dim, '')
-                    sex = dim_values.get(sex_dim, 'Both sexes')
-                    statistic = dim_values.get(statistic_dim, 'Population')
-                    census_year = dim_values.get(year_dim, str(year))
-
-                    include_record = False
-                    
-                    if year == 2011:
-                        include_record = (
-                            county != 'State' and 
-                            sex == 'Both sexes' and 
-                            statistic == 'Population' and
-                            str(year) in census_year
-                        )
-
-                    elif year == 2022:
-                        include_record = (
-                            county.startswith('Co. ') and
-                            'Population per County' in statistic
-                        )
-                        county = county.replace('Co. ', '')
-
-                    
-                    if include_record:
-                        records.append({
-                            'county': county,
-                            'year': year,
-                            'census_year': year,
-                            'population': values[idx],
-                            'statistic': 'Population per County'
-                        })
+            # Label filters per dimension (dimension, predicate, label assumed when the dimension is absent)
+            if year == 2011:
+                label_filters = [
+                    (county_dim, lambda label: label != 'State', ''),
+                    (sex_dim, lambda label: label == 'Both sexes', 'Both sexes'),
+                    (statistic_dim, lambda label: label == 'Population', 'Population'),
+                    (year_dim, lambda label: year_label in label, year_label)
+                ]
+            elif year == 2022:
+                label_filters = [
+                    (county_dim, lambda label: label.startswith('Co. '), ''),
+                    (statistic_dim, lambda label: 'Population per County' in label, 'Population')
+                ]
+            else:
+                # Only the 2011 and 2022 census layouts are extracted
+                label_filters = [(None, lambda label: False, '')]
             
-            self.logger.info(f"Extracted {len(records)} raw records from {year} census")
+            # Classify each dimension's labels once; a cell is kept when all of its labels pass
+            keep = ~np.isnan(values[:n_cells])
+            cell_idx = np.arange(n_cells)
+            for dim_id, predicate, default in label_filters:
+                i = dim_pos.get(dim_id)
+                if i is None:
+                    if not predicate(default):
+                        keep[:] = False
+                    continue
+                label_ok = np.array([predicate(label) for label in labels_per_dim[i]], dtype=bool)
+                keep &= label_ok[(cell_idx // strides[i]) % dim_sizes[i]]
+            
+            county_pos = dim_pos[county_dim]
+            county_names = labels_per_dim[county_pos]
+            if year == 2022:
+                county_names = [county.replace('Co. ', '') for county in county_names]
+            
+            for idx in np.flatnonzero(keep).tolist():
+                records.append({
+                    'county': county_names[(idx // strides[county_pos]) % dim_sizes[county_pos]],
+                    'year': year,
+                    'census_year': year,
+                    'population': int(values[idx]),
+                    'statistic': 'Population per County'
+                })
+            
+            self.logger.info("Extracted %d raw records from %s census", len(records), year)
             
             aggregated_records = self._aggregate_city_county_pairs(records)
             
@@ -355,27 +581,20 @@ class DataCollector:
         """
         Aggregate city and county pairs (Cork City + Cork County = Cork, etc.)
         """
-        from .constants import IrishCounties
+        if not records:
+            return []
         
-        aggregated = {}
+        df = pd.DataFrame(records)
         
-        for record in records:
-            county = record['county']
-            population = record['population']
-            
-            # Get the base county name (or use original if no mapping)
-            base_county = IrishCounties.AGGREGATION_MAPPING.get(county, county)
-            
-            # Initialize aggregated record if not exists
-            if base_county not in aggregated:
-                aggregated[base_county] = record.copy()
-                aggregated[base_county]['county'] = base_county
-                aggregated[base_county]['population'] = 0
-            
-            # Add population to the aggregated record
-            aggregated[base_county]['population'] += population
+        # Get the base county name (or use original if no mapping); a categorical maps each distinct name only once
+        df['county'] = df['county'].astype('category').map(lambda county: IrishCounties.AGGREGATION_MAPPING.get(county, county))
         
-        return list(aggregated.values())
+        # Sum populations per base county, keeping the first record's other fields in first-seen order
+        aggregations = {column: 'first' for column in df.columns if column != 'county'}
+        aggregations['population'] = 'sum'
+        aggregated = df.groupby('county', sort=False).agg(aggregations).reset_index()
+        
+        return aggregated[df.columns].to_dict('records')
     
     def _extract_national_total_2016(self, data: dict, dataset_code: str) -> dict:
         """
@@ -384,7 +603,7 @@ class DataCollector:
         """
         try:
             dimensions = data.get('dimension', {})
-            values = data.get('value', [])
+            values = self._jsonstat_values(data.get('value', []))
 
             area_dim = None
             year_dim = None
@@ -404,33 +623,40 @@ class DataCollector:
             if not area_dim:
                 return None
 
-            import itertools
             dim_names = list(dimensions.keys())
-            dim_values_lists = [list(dimensions[dim_id]['category']['label'].values()) for dim_id in dim_names]
+            labels_per_dim = [list(dimensions[dim_id]['category']['label'].values()) for dim_id in dim_names]
+            dim_sizes = [len(labels) for labels in labels_per_dim]
+            strides = self._jsonstat_strides(dim_sizes)
+            n_cells = min(int(np.prod(dim_sizes)), len(values))
+            dim_pos = {dim_id: i for i, dim_id in enumerate(dim_names)}
             
-            for idx, combination in enumerate(itertools.product(*dim_values_lists)):
-                if idx < len(values) and values[idx] is not None:
-                    dim_values = dict(zip(dim_names, combination))
-                    
-                    area = dim_values.get(area_dim, '')
-                    year_val = dim_values.get(year_dim, '') if year_dim else ''
-                    statistic = dim_values.get(statistic_dim, '') if statistic_dim else ''
-
-                    is_ireland = area in ['State', 'Ireland', 'National']
-                    is_2016 = '2016' in str(year_val) or '2016' in str(statistic)
-                    is_population = 'population' in statistic.lower() or 'persons' in statistic.lower()
-                    
-                    if is_ireland and is_2016 and (is_population or not statistic_dim):
-                        return {
-                            'county': 'Ireland',
-                            'year': 2016,
-                            'census_year': 2016,
-                            'population': values[idx],
-                            'statistic': 'Population per County'
-                        }
+            cell_idx = np.arange(n_cells)
+            
+            def label_flags(dim_id, predicate):
+                # Evaluate the predicate once per label and broadcast it to every cell ('' when the dimension is absent)
+                i = dim_pos.get(dim_id)
+                if i is None:
+                    return np.full(n_cells, predicate(''))
+                label_ok = np.array([predicate(str(label)) for label in labels_per_dim[i]], dtype=bool)
+                return label_ok[(cell_idx // strides[i]) % dim_sizes[i]]
+            
+            has_value = ~np.isnan(values[:n_cells])
+            is_ireland = label_flags(area_dim, lambda label: label in ['State', 'Ireland', 'National'])
+            is_2016 = label_flags(year_dim, lambda label: '2016' in label) | label_flags(statistic_dim, lambda label: '2016' in label)
+            is_population = label_flags(statistic_dim, lambda label: 'population' in label.lower() or 'persons' in label.lower())
+            
+            matches = np.flatnonzero(has_value & is_ireland & is_2016 & (is_population | (not statistic_dim)))
+            if matches.size:
+                return {
+                    'county': 'Ireland',
+                    'year': 2016,
+                    'census_year': 2016,
+                    'population': int(values[matches[0]]),
+                    'statistic': 'Population per County'
+                }
             
         except Exception as e:
-            self.logger.debug(f"Error extracting 2016 national total from {dataset_code}: {str(e)}")
+            self.logger.debug("Error extracting 2016 national total from %s: %s", dataset_code, e)
         
         return None
     
@@ -439,8 +665,9 @@ class DataCollector:
         Lazy initialization of fallback data generator
         Only creates the generator when fallback data is actually needed
         """
-        if self._fallback_generator is None:
-            self.logger.info("Initializing fallback data generator")
-            self._fallback_generator = FallbackDataGenerator()
+        # Collectors run on worker threads, so guard the lazy initialization
+        with self._fallback_lock:
+            if self._fallback_generator is None:
+                self.logger.info("Initializing fallback data generator")
+                self._fallback_generator = FallbackDataGenerator()
         return self._fallback_generator
-
@@ -6,21 +6,37 @@ Handles data cleaning, transformation, and preparation for pollution-water-popul
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, Tuple, Any
+import re
+from typing import Dict, Tuple, Any, Optional
 from .constants import (
     TableNames, WaterQualityColumns, PollutionColumns, 
     PopulationColumns, IntegratedColumns, IrishCounties, AnalysisConstants
 )
 
+# Prefixes and suffixes stripped from county names, removed in a single scan
+_COUNTY_AFFIXES = re.compile(r'Co\. | County Council| City Council')
+
+# Numeric integrated columns that are never median-filled (population stays NaN if truly missing)
+_UNFILLED_COLUMNS = frozenset({IntegratedColumns.POPULATION, 'total_national_population'})
+
 class DataProcessor:
     """Processes and transforms pollution, water quality, and population datasets"""
     
     # Counties to include in analysis (only those with both water quality and population data)
-    ANALYSIS_COUNTIES = [
+    ANALYSIS_COUNTIES = frozenset([
         'Clare', 'Cork', 'Cork City', 'Donegal', 'Dublin', 'Dublin City', 'Fingal', 
         'Galway', 'Galway City', 'Kerry', 'Leitrim', 'Louth', 'Mayo', 'Meath', 
         'Sligo', 'Tipperary', 'Waterford', 'Westmeath', 'Wexford', 'Wicklow'
-    ]
+    ])
+    
+    # Bathing water classes in score order (Poor=1 .. Excellent=4)
+    WATER_QUALITY_CLASSES = pd.Index(['Poor', 'Sufficient', 'Good', 'Excellent'])
+    
+    # Narrow integer dtypes for the year keys that every groupby and merge shuffles
+    NARROW_DTYPES = {'year': 'int16', 'census_year': 'int16'}
+    
+    # Sorted categories so grouping on codes orders counties the same way as grouping on names
+    ANALYSIS_COUNTY_DTYPE = pd.CategoricalDtype(sorted(ANALYSIS_COUNTIES))
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
@@ -30,7 +46,7 @@ class DataProcessor:
         processed_data = {}
         
         try:
-            pollution_data = db_manager.load_dataset(TableNames.RAW_POLLUTION)
+            pollution_data = self._reduce_pollution_chunks(db_manager.load_dataset_chunks(TableNames.RAW_POLLUTION))
             water_quality_data = db_manager.load_dataset(TableNames.RAW_WATER_QUALITY)
             population_data = db_manager.load_dataset(TableNames.RAW_POPULATION)
             
@@ -52,9 +68,16 @@ class DataProcessor:
             self.logger.error(f"Error processing data: {str(e)}")
             raise
     
+    def _shrink(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Downcast the year and census year columns (when present and integral) to narrow dtypes"""
+        narrow = {col: dtype for col, dtype in self.NARROW_DTYPES.items()
+                  if col in df.columns and pd.api.types.is_integer_dtype(df[col])}
+        return df.astype(narrow) if narrow else df
+    
     def _process_pollution_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Clean and process air pollution emissions data"""
-        processed_df = df.copy()
+        # Columns are only ever reassigned, so a shallow copy keeps the caller's frame untouched
+        processed_df = df.copy(deep=False)
         
         # Check if this is national-level data
         is_national = 'geographic_level' in processed_df.columns and \
@@ -66,18 +89,16 @@ class DataProcessor:
             processed_df['data_type'] = 'county'
         
         processed_df[PollutionColumns.YEAR] = processed_df[PollutionColumns.YEAR].astype(int)
+        processed_df = self._shrink(processed_df)
         
         # Normalize county names (if county-level data) but DO NOT filter
         if not is_national and PollutionColumns.COUNTY in processed_df.columns:
-            processed_df[PollutionColumns.COUNTY] = processed_df[PollutionColumns.COUNTY].apply(self._normalize_county_name)
+            processed_df[PollutionColumns.COUNTY] = self._normalize_county_column(processed_df[PollutionColumns.COUNTY])
         
-        # Pivot to get pollutants as columns
-        pollution_pivot = processed_df.pivot_table(
-            index=[PollutionColumns.COUNTY, PollutionColumns.YEAR],
-            columns=PollutionColumns.POLLUTANT,
-            values=PollutionColumns.VALUE,
-            aggfunc='sum'
-        ).reset_index()
+        # Pivot to get pollutants as columns (a plain groupby sum avoids pivot_table's generic margins/dropna path)
+        pollution_pivot = processed_df.groupby(
+            [PollutionColumns.COUNTY, PollutionColumns.YEAR, PollutionColumns.POLLUTANT]
+        )[PollutionColumns.VALUE].sum().unstack(PollutionColumns.POLLUTANT).reset_index()
         
         pollution_pivot.columns.name = None
         
@@ -97,21 +118,44 @@ class DataProcessor:
         
         # Calculate pollution index (normalized 0-100, higher = more pollution)
         if PollutionColumns.TOTAL_EMISSIONS in pollution_pivot.columns:
-            max_emissions = pollution_pivot[PollutionColumns.TOTAL_EMISSIONS].max()
+            total_emissions = pollution_pivot[PollutionColumns.TOTAL_EMISSIONS].to_numpy()
+            max_emissions = np.nanmax(total_emissions) if total_emissions.size else np.nan
             if max_emissions > 0:
-                pollution_pivot[PollutionColumns.POLLUTION_INDEX] = (
-                    pollution_pivot[PollutionColumns.TOTAL_EMISSIONS] / max_emissions * 100
-                )
+                # One multiply by the precomputed scale instead of divide-then-multiply
+                pollution_pivot[PollutionColumns.POLLUTION_INDEX] = total_emissions * (100.0 / max_emissions)
             else:
                 pollution_pivot[PollutionColumns.POLLUTION_INDEX] = 0
         
         return pollution_pivot
     
+    def _reduce_pollution_chunks(self, chunks) -> pd.DataFrame:
+        """
+        Pre-aggregate raw pollution chunks to one summed value per county, year, pollutant and geographic level
+        The pollutant pivot sums these values anyway, so only the reduced rows are held in memory
+        """
+        group_cols = [PollutionColumns.COUNTY, PollutionColumns.YEAR, PollutionColumns.POLLUTANT]
+        partial_sums = []
+        
+        for chunk in chunks:
+            keys = group_cols + [col for col in ['geographic_level'] if col in chunk.columns]
+            partial_sums.append(chunk.groupby(keys, dropna=False)[PollutionColumns.VALUE].sum().reset_index())
+        
+        if not partial_sums:
+            return pd.DataFrame(columns=group_cols + [PollutionColumns.VALUE])
+        if len(partial_sums) == 1:
+            return partial_sums[0]
+        
+        # Combine the per-chunk sums
+        combined = pd.concat(partial_sums, ignore_index=True)
+        keys = [col for col in combined.columns if col != PollutionColumns.VALUE]
+        return combined.groupby(keys, dropna=False)[PollutionColumns.VALUE].sum().reset_index()
+    
     def _process_water_quality_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Clean and process water quality classification data"""
-        processed_df = df.copy()
+        processed_df = df.copy(deep=False)
         
         processed_df[WaterQualityColumns.YEAR] = processed_df[WaterQualityColumns.YEAR].astype(int)
+        processed_df = self._shrink(processed_df)
         
         # Handle different column names from real API vs fallback
         if 'statistic' in processed_df.columns and WaterQualityColumns.CLASSIFICATION not in processed_df.columns:
@@ -123,23 +167,32 @@ class DataProcessor:
             processed_df[WaterQualityColumns.COUNTY] = processed_df[WaterQualityColumns.COUNTY].str.replace('Co. ', '', regex=False)
             processed_df[WaterQualityColumns.COUNTY] = processed_df[WaterQualityColumns.COUNTY].str.strip()
         
+        # Normalize county names and keep only analysis counties before any per-row scoring
+        processed_df[WaterQualityColumns.COUNTY] = self._normalize_county_column(processed_df[WaterQualityColumns.COUNTY])
+        county_dtype = processed_df[WaterQualityColumns.COUNTY].dtype
+        
+        # Names outside the analysis counties get code -1
+        county_codes = self.ANALYSIS_COUNTY_DTYPE.categories.get_indexer(processed_df[WaterQualityColumns.COUNTY])
+        in_analysis = county_codes >= 0
+        
+        # Group on categorical county codes rather than hashing strings; names are restored on the result
+        processed_df = processed_df[in_analysis].assign(**{
+            WaterQualityColumns.COUNTY: pd.Categorical.from_codes(county_codes[in_analysis], dtype=self.ANALYSIS_COUNTY_DTYPE)
+        })
+        
         # Ensure quality_score exists (convert classification to numeric if needed)
         if WaterQualityColumns.QUALITY_SCORE not in processed_df.columns:
-            classification_map = {
-                'Excellent': 4,
-                'Good': 3,
-                'Sufficient': 2,
-                'Poor': 1
-            }
-            processed_df[WaterQualityColumns.QUALITY_SCORE] = processed_df[WaterQualityColumns.CLASSIFICATION].map(classification_map)
+            # Score is the class code + 1; unknown classifications (code -1) get no score
+            class_codes = self.WATER_QUALITY_CLASSES.get_indexer(processed_df[WaterQualityColumns.CLASSIFICATION])
+            processed_df[WaterQualityColumns.QUALITY_SCORE] = np.where(class_codes >= 0, class_codes + 1, np.nan)
         
         processed_df[WaterQualityColumns.IS_EXCELLENT] = (
             processed_df[WaterQualityColumns.QUALITY_SCORE] >= AnalysisConstants.EXCELLENT_THRESHOLD
-        ).astype(int)
+        ).astype('uint8')
         
         processed_df[WaterQualityColumns.IS_GOOD_OR_BETTER] = (
             processed_df[WaterQualityColumns.QUALITY_SCORE] >= AnalysisConstants.GOOD_THRESHOLD
-        ).astype(int)
+        ).astype('uint8')
         
         agg_dict = {
             WaterQualityColumns.QUALITY_SCORE: 'mean',
@@ -154,13 +207,10 @@ class DataProcessor:
             # Use any column for counting records
             agg_dict[WaterQualityColumns.CLASSIFICATION] = 'count'
         
-        # Normalize county names BEFORE groupby
-        processed_df[WaterQualityColumns.COUNTY] = processed_df[WaterQualityColumns.COUNTY].apply(self._normalize_county_name)
-        
-        # Filter to only include analysis counties
-        processed_df = processed_df[processed_df[WaterQualityColumns.COUNTY].isin(self.ANALYSIS_COUNTIES)]
-        
-        county_year_agg = processed_df.groupby([WaterQualityColumns.COUNTY, WaterQualityColumns.YEAR]).agg(agg_dict).reset_index()
+        county_year_agg = processed_df.groupby(
+            [WaterQualityColumns.COUNTY, WaterQualityColumns.YEAR], observed=True
+        ).agg(agg_dict).reset_index()
+        county_year_agg[WaterQualityColumns.COUNTY] = county_year_agg[WaterQualityColumns.COUNTY].astype(county_dtype)
         
         # Rename aggregated columns
         rename_dict = {
@@ -183,50 +233,36 @@ class DataProcessor:
     
     def _process_population_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Clean and process population data from multiple census years"""
-        processed_df = df.copy()
+        processed_df = df.copy(deep=False)
         
         processed_df[PopulationColumns.YEAR] = processed_df[PopulationColumns.YEAR].astype(int)
+        processed_df = self._shrink(processed_df)
         
         # Normalize county names BEFORE filtering
-        processed_df[PopulationColumns.COUNTY] = processed_df[PopulationColumns.COUNTY].apply(self._normalize_county_name)
+        processed_df[PopulationColumns.COUNTY] = self._normalize_county_column(processed_df[PopulationColumns.COUNTY])
         
         # Filter to county-level data only (exclude town/electoral division level)
         # For 2011: Keep "State" level (will be renamed to Ireland)
         # For 2016: Filter to county-level aggregates (need to aggregate from electoral divisions)
         # For 2022: Keep "Population per County" statistic
         
-        # Identify county-level records
-        county_level_records = []
-        
-        # 2022 Census: Direct county-level data (exclude "Ireland" national aggregate)
-        census_2022 = processed_df[
-            (processed_df['census_year'] == 2022) &
-            (processed_df['statistic'] == 'Population per County') &
-            (processed_df[PopulationColumns.COUNTY] != 'Ireland')
-        ].copy()
-        if len(census_2022) > 0:
-            county_level_records.append(census_2022)
-        
-        census_2016 = processed_df[
-            (processed_df['census_year'] == 2016) &
-            (processed_df['statistic'] == 'Population per County') &
-            (processed_df[PopulationColumns.COUNTY] == 'Ireland')
-        ].copy()
-        if len(census_2016) > 0:
-            county_level_records.append(census_2016)
-        
-        # 2011 Census: County-level data (real CSO API data)
-        census_2011 = processed_df[
-            (processed_df['census_year'] == 2011) &
-            (processed_df['statistic'] == 'Population per County') &
-            (processed_df[PopulationColumns.COUNTY] != 'Ireland')
-        ].copy()
-        if len(census_2011) > 0:
-            county_level_records.append(census_2011)
+        # Identify county-level records (row positions per census, gathered in one take instead of a concat)
+        is_county_statistic = (processed_df['statistic'] == 'Population per County').to_numpy()
+        is_ireland = (processed_df[PopulationColumns.COUNTY] == 'Ireland').to_numpy()
+        census_year = processed_df['census_year'].to_numpy()
+        
+        county_level_rows = np.concatenate([
+            # 2022 Census: Direct county-level data (exclude "Ireland" national aggregate)
+            np.flatnonzero(is_county_statistic & (census_year == 2022) & ~is_ireland),
+            # 2016 Census: National total only
+            np.flatnonzero(is_county_statistic & (census_year == 2016) & is_ireland),
+            # 2011 Census: County-level data (real CSO API data)
+            np.flatnonzero(is_county_statistic & (census_year == 2011) & ~is_ireland)
+        ])
         
         # Combine all county-level records
-        if county_level_records:
-            processed_df = pd.concat(county_level_records, ignore_index=True)
+        if county_level_rows.size:
+            processed_df = processed_df.take(county_level_rows).reset_index(drop=True)
         else:
             self.logger.warning("No county-level population data found")
             return pd.DataFrame()
@@ -256,32 +292,35 @@ class DataProcessor:
         processed_df = processed_df.sort_values([PopulationColumns.COUNTY, PopulationColumns.YEAR])
         
         # Calculate population density (population per km²)
-        processed_df[PopulationColumns.POPULATION_DENSITY] = processed_df.apply(
-            lambda row: row[PopulationColumns.POPULATION] / IrishCounties.COUNTY_AREAS.get(row[PopulationColumns.COUNTY], 1000),
-            axis=1
-        )
+        areas = processed_df[PopulationColumns.COUNTY].map(IrishCounties.COUNTY_AREAS).fillna(1000)
+        processed_df[PopulationColumns.POPULATION_DENSITY] = processed_df[PopulationColumns.POPULATION] / areas
+        
+        # Rows are already sorted by county, so the groups need no second sort
+        county_population = processed_df.groupby(PopulationColumns.COUNTY, sort=False)[PopulationColumns.POPULATION]
         
         # Calculate year-over-year population growth
-        processed_df[PopulationColumns.POPULATION_GROWTH] = processed_df.groupby(PopulationColumns.COUNTY)[PopulationColumns.POPULATION].pct_change() * 100
+        processed_df[PopulationColumns.POPULATION_GROWTH] = county_population.pct_change() * 100
         
         # Calculate total growth since first year
-        first_year_pop = processed_df.groupby(PopulationColumns.COUNTY)[PopulationColumns.POPULATION].transform('first')
+        first_year_pop = county_population.transform('first')
         processed_df[PopulationColumns.POPULATION_GROWTH_TOTAL] = (
             (processed_df[PopulationColumns.POPULATION] - first_year_pop) / first_year_pop * 100
         )
         
         return processed_df
     
+    def _normalize_county_column(self, counties: pd.Series) -> pd.Series:
+        """Normalize a county column by normalizing each distinct name once and mapping the results back"""
+        normalized = {county: self._normalize_county_name(county) for county in counties.dropna().unique()}
+        return counties.map(normalized)
+    
     def _normalize_county_name(self, county: str) -> str:
         """Normalize county names for consistent merging"""
         if pd.isna(county):
             return county
         
         # Remove various prefixes and suffixes
-        county = str(county).strip()
-        county = county.replace('Co. ', '')
-        county = county.replace(' County Council', '')
-        county = county.replace(' City Council', '')
+        county = _COUNTY_AFFIXES.sub('', str(county).strip())
         
         # Apply county normalization mapping from constants
         if county in IrishCounties.NORMALIZATION_MAPPING:
@@ -301,9 +340,9 @@ class DataProcessor:
         2. pollution_vs_water: Pollution vs Water Quality (water quality years)
         3. integrated_water_quality: Water Quality vs Population (water quality years with 2022 census forward-filled)
         """
-        pollution_df = processed_data['pollution'].copy()
-        water_quality_df = processed_data['water_quality'].copy()
-        population_df = processed_data['population'].copy()
+        pollution_df = processed_data['pollution']
+        water_quality_df = processed_data['water_quality']
+        population_df = processed_data['population']
         
         # Check if pollution is national-level
         is_national_pollution = 'data_type' in pollution_df.columns and \
@@ -313,22 +352,33 @@ class DataProcessor:
             return {'integrated_water_quality': self._create_integrated_dataset(processed_data)}
         
         # Get national pollution data
-        national_pollution = pollution_df[pollution_df['data_type'] == 'national'].copy()
+        national_pollution = pollution_df[pollution_df['data_type'] == 'national']
         
         # Filter population data to only include actual county population (not other statistics)
         county_pop = population_df[
             (population_df['statistic'] == 'Population per County') |
             (population_df['statistic'] == 'Population per  County')  # Handle potential double space
-        ].copy()
+        ]
         
         # Get census years available
         census_years = sorted(county_pop['census_year'].unique())
         self.logger.info(f"Census years available: {census_years}")
         
+        # Projections shared by the builders, computed once
+        total_pop_by_year = self._national_population_by_year(county_pop)
+        pollution_water_years = self._pollution_for_years(national_pollution, water_quality_df['year'].unique())
+        
         # Create three integrated datasets
-        pollution_vs_pop = self._create_pollution_vs_population(national_pollution, county_pop, census_years)
-        pollution_vs_water = self._create_pollution_vs_water(national_pollution, water_quality_df)
-        integrated_water_quality = self._create_water_vs_population(water_quality_df, county_pop, national_pollution)
+        pollution_vs_pop = self._create_pollution_vs_population(
+            national_pollution, county_pop, census_years, total_pop_by_year=total_pop_by_year
+        )
+        pollution_vs_water = self._create_pollution_vs_water(
+            national_pollution, water_quality_df, pollution_water_years=pollution_water_years
+        )
+        integrated_water_quality = self._create_water_vs_population(
+            water_quality_df, county_pop, national_pollution,
+            pollution_water_years=pollution_water_years, total_pop_by_year=total_pop_by_year
+        )
         
         return {
             'pollution_vs_population': pollution_vs_pop,
@@ -336,54 +386,45 @@ class DataProcessor:
             'integrated_water_quality': integrated_water_quality
         }
     
+    def _national_population_by_year(self, county_pop: pd.DataFrame) -> pd.DataFrame:
+        """Total national population by year, summed over the county records"""
+        total_pop_by_year = county_pop.groupby('year').agg({
+            'population': 'sum'
+        }).reset_index()
+        total_pop_by_year.rename(columns={'population': 'total_national_population'}, inplace=True)
+        return total_pop_by_year
+    
+    def _pollution_for_years(self, national_pollution: pd.DataFrame, years) -> pd.DataFrame:
+        """National pollution rows for the given years, without the county column (for year-only merges)"""
+        return national_pollution[national_pollution['year'].isin(years)].drop(columns=['county'])
+    
     def _create_pollution_vs_population(self, national_pollution: pd.DataFrame, 
                                        county_pop: pd.DataFrame, 
-                                       census_years: list) -> pd.DataFrame:
+                                       census_years: list,
+                                       total_pop_by_year: Optional[pd.DataFrame] = None) -> pd.DataFrame:
         """Create Pollution vs Population dataset for census years only"""
         # Filter pollution data to census years
-        pollution_census = national_pollution[national_pollution['year'].isin(census_years)].copy()
+        pollution_census = national_pollution[national_pollution['year'].isin(census_years)]
         
         # Filter population to census years
-        pop_census = county_pop[county_pop['census_year'].isin(census_years)].copy()
+        pop_census = county_pop[county_pop['census_year'].isin(census_years)]
         
-        # Get unique counties
-        counties = pop_census['county'].unique()
+        # For each county-census year, add the national pollution of that year (first record per year)
+        pollution_by_year = pollution_census.drop_duplicates('year').drop(columns=['county', 'data_type'], errors='ignore')
+        df = pop_census[['county', 'year', 'census_year', 'population']].merge(pollution_by_year, on='year', how='inner')
         
-        # Create dataset: for each county-census year, add national pollution
-        records = []
-        for _, pop_row in pop_census.iterrows():
-            county = pop_row['county']
-            year = pop_row['year']
-            
-            # Get pollution for this year
-            poll_year = pollution_census[pollution_census['year'] == year]
-            
-            if len(poll_year) > 0:
-                poll_data = poll_year.iloc[0].to_dict()
-                record = {
-                    'county': county,
-                    'year': year,
-                    'census_year': pop_row['census_year'],
-                    'population': pop_row['population'],
-                    'total_emissions': poll_data.get('total_emissions', None),
-                    'pollution_index': poll_data.get('pollution_index', None),
-                    'data_type': 'pollution_vs_population'
-                }
-                
-                # Add all pollution columns
-                for col in poll_data:
-                    if col not in record and col not in ['county', 'year', 'data_type']:
-                        record[col] = poll_data[col]
-                
-                records.append(record)
-        
-        df = pd.DataFrame(records)
+        for col in ['total_emissions', 'pollution_index']:
+            if col not in df.columns:
+                df[col] = None
+        df['data_type'] = 'pollution_vs_population'
+        
+        # Lead with the record columns, followed by all other pollution columns
+        leading_cols = ['county', 'year', 'census_year', 'population', 'total_emissions', 'pollution_index', 'data_type']
+        df = df[leading_cols + [col for col in df.columns if col not in leading_cols]]
         
         # Calculate total national population by year
-        total_pop_by_year = county_pop.groupby('year').agg({
-            'population': 'sum'
-        }).reset_index()
-        total_pop_by_year.rename(columns={'population': 'total_national_population'}, inplace=True)
+        if total_pop_by_year is None:
+            total_pop_by_year = self._national_population_by_year(county_pop)
         
         df = df.merge(total_pop_by_year, on='year', how='left')
         
@@ -398,17 +439,16 @@ class DataProcessor:
         return df
     
     def _create_pollution_vs_water(self, national_pollution: pd.DataFrame, 
-                                   water_quality_df: pd.DataFrame) -> pd.DataFrame:
+                                   water_quality_df: pd.DataFrame,
+                                   pollution_water_years: Optional[pd.DataFrame] = None) -> pd.DataFrame:
         """Create Pollution vs Water Quality dataset"""
-        # Get water quality years
-        water_years = water_quality_df['year'].unique()
-        
         # Filter pollution to water quality years
-        pollution_water_years = national_pollution[national_pollution['year'].isin(water_years)].copy()
+        if pollution_water_years is None:
+            pollution_water_years = self._pollution_for_years(national_pollution, water_quality_df['year'].unique())
         
         # Merge water quality with pollution (by year only, broadcast national pollution to all counties)
         df = water_quality_df.merge(
-            pollution_water_years.drop(columns=['county']),
+            pollution_water_years,
             on='year',
             how='left'
         )
@@ -419,7 +459,9 @@ class DataProcessor:
     
     def _create_water_vs_population(self, water_quality_df: pd.DataFrame,
                                    county_pop: pd.DataFrame,
-                                   national_pollution: pd.DataFrame) -> pd.DataFrame:
+                                   national_pollution: pd.DataFrame,
+                                   pollution_water_years: Optional[pd.DataFrame] = None,
+                                   total_pop_by_year: Optional[pd.DataFrame] = None) -> pd.DataFrame:
         """Create Water Quality vs Population dataset (current methodology with 2022 forward-filled)"""
         # Get water quality years and counties
         water_years = water_quality_df['year'].unique()
@@ -429,18 +471,22 @@ class DataProcessor:
         pop_counties = county_pop['county'].unique()
         valid_counties = [c for c in water_counties if c in pop_counties and c != 'Ireland']
         
+        # Shared categorical county key so the merges below join on integer codes; names are restored on the result
+        county_dtype = water_quality_df['county'].dtype
+        county_key = pd.CategoricalDtype(valid_counties)
+        
         # Filter water quality to valid counties
-        water_filtered = water_quality_df[water_quality_df['county'].isin(valid_counties)].copy()
+        water_filtered = water_quality_df[water_quality_df['county'].isin(valid_counties)].astype({'county': county_key})
         
         # Create county-year grid for population forward-filling
-        county_year_grid = pd.DataFrame([
-            {'county': county, 'year': year}
-            for county in valid_counties
-            for year in water_years
-        ])
+        county_year_grid = pd.MultiIndex.from_product(
+            [valid_counties, water_years], names=['county', 'year']
+        ).to_frame(index=False).astype({'county': county_key})
         
         # Merge with available population data (2022 census)
-        county_pop_2022 = county_pop[county_pop['census_year'] == 2022][['county', 'year', 'population']].copy()
+        county_pop_2022 = county_pop[
+            (county_pop['census_year'] == 2022) & county_pop['county'].isin(valid_counties)
+        ][['county', 'year', 'population']].astype({'county': county_key})
         
         county_pop_expanded = county_year_grid.merge(
             county_pop_2022,
@@ -450,8 +496,8 @@ class DataProcessor:
         
         # Forward and backward fill population
         county_pop_expanded = county_pop_expanded.sort_values(['county', 'year'])
-        county_pop_expanded['population'] = county_pop_expanded.groupby('county')['population'].ffill()
-        county_pop_expanded['population'] = county_pop_expanded.groupby('county')['population'].bfill()
+        county_pop_expanded['population'] = county_pop_expanded.groupby('county', observed=True)['population'].ffill()
+        county_pop_expanded['population'] = county_pop_expanded.groupby('county', observed=True)['population'].bfill()
         
         # Merge water quality with population
         df = water_filtered.merge(
@@ -459,20 +505,20 @@ class DataProcessor:
             on=['county', 'year'],
             how='left'
         )
+        df['county'] = df['county'].astype(county_dtype)
         
         # Add national pollution data
-        pollution_water_years = national_pollution[national_pollution['year'].isin(water_years)].copy()
+        if pollution_water_years is None:
+            pollution_water_years = self._pollution_for_years(national_pollution, water_years)
         df = df.merge(
-            pollution_water_years.drop(columns=['county']),
+            pollution_water_years,
             on='year',
             how='left'
         )
         
         # Calculate total national population by year
-        total_pop_by_year = county_pop.groupby('year').agg({
-            'population': 'sum'
-        }).reset_index()
-        total_pop_by_year.rename(columns={'population': 'total_national_population'}, inplace=True)
+        if total_pop_by_year is None:
+            total_pop_by_year = self._national_population_by_year(county_pop)
         
         df = df.merge(total_pop_by_year, on='year', how='left')
         
@@ -498,11 +544,11 @@ class DataProcessor:
         3. Water Quality vs Population (water quality years with 2022 census forward-filled)
         """
         # Get datasets (county names already normalized during processing)
-        water_quality_df = processed_data['water_quality'].copy()
-        population_df = processed_data['population'].copy()
+        water_quality_df = processed_data['water_quality']
+        population_df = processed_data['population']
         
         # Check if pollution data is national-level
-        pollution_df = processed_data['pollution'].copy()
+        pollution_df = processed_data['pollution']
         is_national_pollution = 'data_type' in pollution_df.columns and \
                                (pollution_df['data_type'] == 'national').any()
         
@@ -517,10 +563,10 @@ class DataProcessor:
             integrated = water_quality_df[
                 (water_quality_df[WaterQualityColumns.COUNTY].isin(counties_with_population)) &
                 (water_quality_df[WaterQualityColumns.COUNTY] != 'Ireland')
-            ].copy()
+            ]
             
             # Add national pollution data to each county row
-            national_pollution = pollution_df[pollution_df['data_type'] == 'national'].copy()
+            national_pollution = pollution_df[pollution_df['data_type'] == 'national']
             
             # Merge pollution by year only (broadcast national data to all counties)
             integrated = integrated.merge(
@@ -548,7 +594,7 @@ class DataProcessor:
                 PopulationColumns.COUNTY,
                 PopulationColumns.YEAR,
                 PopulationColumns.POPULATION
-            ]].copy()
+            ]]
             
             # Since population data is only available for 2022, we need to forward-fill for other years
             # Get all unique counties and years from integrated dataset
@@ -558,11 +604,9 @@ class DataProcessor:
             self.logger.info(f"Found {len(all_counties)} counties and {len(all_years)} years in water quality data")
             
             # Create a complete county-year grid
-            county_year_grid = pd.DataFrame([
-                {PopulationColumns.COUNTY: county, PopulationColumns.YEAR: year}
-                for county in all_counties
-                for year in all_years
-            ])
+            county_year_grid = pd.MultiIndex.from_product(
+                [all_counties, all_years], names=[PopulationColumns.COUNTY, PopulationColumns.YEAR]
+            ).to_frame(index=False)
             
             # Merge with available population data
             county_pop_expanded = county_year_grid.merge(
@@ -592,9 +636,9 @@ class DataProcessor:
             
         else:
             # Original county-level logic
-            integrated = pollution_df.copy()
+            keys = [PollutionColumns.COUNTY, PollutionColumns.YEAR]
             
-            # Merge population data
+            # Population columns to merge
             population = population_df[[
                 PopulationColumns.COUNTY,
                 PopulationColumns.YEAR,
@@ -604,19 +648,12 @@ class DataProcessor:
                 PopulationColumns.POPULATION_GROWTH_TOTAL
             ]]
             
-            integrated = integrated.merge(
-                population,
-                left_on=[PollutionColumns.COUNTY, PollutionColumns.YEAR],
-                right_on=[PopulationColumns.COUNTY, PopulationColumns.YEAR],
-                how='outer'
-            )
-            
-            # Merge water quality
-            integrated = integrated.merge(
-                water_quality_df,
-                on=[PollutionColumns.COUNTY, PollutionColumns.YEAR],
-                how='outer'
-            )
+            # Outer-join population and water quality onto pollution in one aligned join on the (county, year) index
+            integrated = pollution_df.set_index(keys).join(
+                [population.set_index(keys), water_quality_df.set_index(keys)],
+                how='outer',
+                sort=True
+            ).reset_index()
         
         # Ensure county and year columns are properly named
         if IntegratedColumns.COUNTY not in integrated.columns:
@@ -627,35 +664,54 @@ class DataProcessor:
             if WaterQualityColumns.YEAR in integrated.columns:
                 integrated.rename(columns={WaterQualityColumns.YEAR: IntegratedColumns.YEAR}, inplace=True)
         
-        # Calculate derived metrics
+        # Calculate derived metrics (collected and added in a single assign)
+        derived_metrics = {}
+        
         # Emissions per capita (use total national population for national emissions)
         if IntegratedColumns.TOTAL_EMISSIONS in integrated.columns:
             if 'total_national_population' in integrated.columns and is_national_pollution:
                 self.logger.info("Calculating emissions per capita using TOTAL NATIONAL POPULATION (national emissions)")
-                integrated[IntegratedColumns.EMISSIONS_PER_CAPITA] = (
-                    integrated[IntegratedColumns.TOTAL_EMISSIONS] / integrated['total_national_population'] * 1000
-                )
+                per_capita_population = integrated['total_national_population']
             elif IntegratedColumns.POPULATION in integrated.columns:
                 self.logger.info("Calculating emissions per capita using county population")
-                integrated[IntegratedColumns.EMISSIONS_PER_CAPITA] = (
-                    integrated[IntegratedColumns.TOTAL_EMISSIONS] / integrated[IntegratedColumns.POPULATION] * 1000
+                per_capita_population = integrated[IntegratedColumns.POPULATION]
+            else:
+                per_capita_population = None
+            
+            if per_capita_population is not None:
+                derived_metrics[IntegratedColumns.EMISSIONS_PER_CAPITA] = (
+                    integrated[IntegratedColumns.TOTAL_EMISSIONS] / per_capita_population * 1000
                 )
         
         # Water quality vs pollution relationship (negative correlation expected)
         if IntegratedColumns.AVG_QUALITY_SCORE in integrated.columns and IntegratedColumns.POLLUTION_INDEX in integrated.columns:
-            # Normalize both to 0-100 scale
-            water_normalized = integrated[IntegratedColumns.AVG_QUALITY_SCORE] / 4 * 100  # Quality score is 1-4
-            pollution_normalized = integrated[IntegratedColumns.POLLUTION_INDEX]
-            
-            # Create relationship metric (higher = better water quality relative to pollution)
-            integrated[IntegratedColumns.WATER_QUALITY_VS_POLLUTION] = water_normalized - pollution_normalized
+            # Normalize water quality to the 0-100 scale of the pollution index (quality score is 1-4, so x / 4 * 100 = x * 25)
+            # Relationship metric: higher = better water quality relative to pollution
+            derived_metrics[IntegratedColumns.WATER_QUALITY_VS_POLLUTION] = (
+                integrated[IntegratedColumns.AVG_QUALITY_SCORE] * 25 - integrated[IntegratedColumns.POLLUTION_INDEX]
+            )
+        
+        if derived_metrics:
+            integrated = integrated.assign(**derived_metrics)
         
         # Fill NaN values for numeric columns (but NOT population - keep it as NaN if truly missing)
         numeric_columns = integrated.select_dtypes(include=[np.number]).columns
         # Exclude population from median filling
-        columns_to_fill = [col for col in numeric_columns if col not in [IntegratedColumns.POPULATION, 'total_national_population']]
+        columns_to_fill = [col for col in numeric_columns if col not in _UNFILLED_COLUMNS]
         if columns_to_fill:
-            integrated[columns_to_fill] = integrated[columns_to_fill].fillna(integrated[columns_to_fill].median())
+            # Column medians and the fill in one pass over a float block; columns with no (or only) NaN are left as they are
+            values = integrated[columns_to_fill].to_numpy(dtype=float, na_value=np.nan)
+            missing = np.isnan(values)
+            fillable = missing.any(axis=0) & ~missing.all(axis=0)
+            if fillable.any():
+                filled = values[:, fillable]
+                np.copyto(filled, np.nanmedian(filled, axis=0), where=missing[:, fillable])
+                # Write each column back in its own float dtype so the fill keeps float32 downcasts
+                filled_columns = {}
+                for col, column_values in zip([col for col, fill in zip(columns_to_fill, fillable) if fill], filled.T):
+                    dtype = integrated[col].dtype
+                    filled_columns[col] = column_values.astype(dtype) if dtype.kind == 'f' else column_values
+                integrated = integrated.assign(**filled_columns)
         
         # Sort by county and year
         integrated = integrated.sort_values([IntegratedColumns.COUNTY, IntegratedColumns.YEAR])
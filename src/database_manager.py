@@ -5,9 +5,10 @@ Database Management Module
 import sqlite3
 import pandas as pd
 import logging
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Connection
 from sqlalchemy.exc import SQLAlchemyError
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, List, Optional
 import os
 
 class DatabaseManager:
@@ -16,35 +17,56 @@ class DatabaseManager:
         self.logger = logging.getLogger(__name__)
         self.db_path = db_path
         
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        # ':memory:' and bare file names have no directory to create
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
         self.engine = create_engine(f'sqlite:///{db_path}')
+        event.listen(self.engine, 'connect', self._configure_sqlite)
+        event.listen(self.engine, 'begin', self._begin_transaction)
         self.logger.info(f"Database initialized at {db_path}")
+    
+    @staticmethod
+    def _configure_sqlite(dbapi_connection, connection_record) -> None:
+        """Use WAL journaling with NORMAL sync so commits do not each force a full fsync"""
+        # Let SQLAlchemy emit BEGIN itself; pysqlite would otherwise autocommit the CREATE TABLE of to_sql
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+    
+    @staticmethod
+    def _begin_transaction(conn) -> None:
+        """Start a real SQLite transaction so table replacement and inserts commit or roll back together"""
+        conn.exec_driver_sql("BEGIN")
         
     def store_datasets(self, datasets: Dict[str, pd.DataFrame]) -> None:
-        """Store all collected datasets in the database"""
+        """Store all collected datasets in the database (in a single transaction)"""
         try:
-            for dataset_name, df in datasets.items():
-                self._store_dataframe(df, dataset_name)
-                self.logger.info(f"Stored {len(df)} records for {dataset_name}")
+            with self.engine.begin() as conn:
+                for dataset_name, df in datasets.items():
+                    self._store_dataframe(df, dataset_name, conn)
+                    self.logger.info(f"Stored {len(df)} records for {dataset_name}")
                 
         except Exception as e:
             self.logger.error(f"Error storing datasets: {str(e)}")
             raise
     
-    def _store_dataframe(self, df: pd.DataFrame, table_name: str) -> None:
-        """Store a pandas DataFrame in the database"""
+    def _store_dataframe(self, df: pd.DataFrame, table_name: str, conn: Optional[Connection] = None) -> None:
+        """Store a pandas DataFrame in the database, inside the caller's transaction when a connection is given"""
         try:
-            df.to_sql(table_name, self.engine, if_exists='replace', index=False)
+            df.to_sql(table_name, conn if conn is not None else self.engine, if_exists='replace', index=False)
             self.logger.debug(f"Stored DataFrame in table: {table_name}")
             
         except SQLAlchemyError as e:
             self.logger.error(f"Database error storing {table_name}: {str(e)}")
             raise
     
-    def load_dataset(self, table_name: str) -> pd.DataFrame:
-        """Load a dataset from the database"""
+    def load_dataset(self, table_name: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Load a dataset from the database, optionally only the given columns"""
         try:
-            query = f"SELECT * FROM {table_name}"
+            query = self._select_query(table_name, columns)
             df = pd.read_sql(query, self.engine)
             self.logger.debug(f"Loaded {len(df)} records from {table_name}")
             return df
@@ -53,26 +75,46 @@ class DatabaseManager:
             self.logger.error(f"Error loading {table_name}: {str(e)}")
             raise
 
+    def load_dataset_chunks(self, table_name: str, chunksize: int = 200_000,
+                            columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        """Load a dataset from the database as chunks of at most chunksize rows"""
+        try:
+            query = self._select_query(table_name, columns)
+            for chunk in pd.read_sql(query, self.engine, chunksize=chunksize):
+                yield chunk
+                
+        except SQLAlchemyError as e:
+            self.logger.error(f"Error loading {table_name}: {str(e)}")
+            raise
+
+    def _select_query(self, table_name: str, columns: Optional[List[str]] = None) -> str:
+        """SELECT statement reading only the requested columns (all columns when none are given)"""
+        if not columns:
+            return f"SELECT * FROM {table_name}"
+        quote = self.engine.dialect.identifier_preparer.quote
+        return f"SELECT {', '.join(quote(column) for column in columns)} FROM {table_name}"
+
     def store_analysis_results(self, results: Dict[str, Any]) -> None:
-        """Store analysis results in the database"""
+        """Store analysis results in the database (in a single transaction)"""
         try:
-            if 'correlations' in results:
-                for analysis_type, corr_data in results['correlations'].items():
-                    if isinstance(corr_data, pd.DataFrame):
-                        table_name = f"analysis_correlation_{analysis_type}"
-                        self._store_dataframe(corr_data, table_name)
-            
-            if 'statistics' in results:
-                for stat_type, stat_data in results['statistics'].items():
-                    if isinstance(stat_data, pd.DataFrame):
-                        table_name = f"analysis_stats_{stat_type}"
-                        self._store_dataframe(stat_data, table_name)
-            
-            if 'processed_data' in results:
-                for dataset_name, df in results['processed_data'].items():
-                    if isinstance(df, pd.DataFrame):
-                        table_name = f"processed_{dataset_name}"
-                        self._store_dataframe(df, table_name)
+            with self.engine.begin() as conn:
+                if 'correlations' in results:
+                    for analysis_type, corr_data in results['correlations'].items():
+                        if isinstance(corr_data, pd.DataFrame):
+                            table_name = f"analysis_correlation_{analysis_type}"
+                            self._store_dataframe(corr_data, table_name, conn)
+                
+                if 'statistics' in results:
+                    for stat_type, stat_data in results['statistics'].items():
+                        if isinstance(stat_data, pd.DataFrame):
+                            table_name = f"analysis_stats_{stat_type}"
+                            self._store_dataframe(stat_data, table_name, conn)
+                
+                if 'processed_data' in results:
+                    for dataset_name, df in results['processed_data'].items():
+                        if isinstance(df, pd.DataFrame):
+                            table_name = f"processed_{dataset_name}"
+                            self._store_dataframe(df, table_name, conn)
             
             self.logger.info("Analysis results stored")
             
@@ -81,25 +123,33 @@ class DatabaseManager:
             raise
     
     def create_indexes(self) -> None:
-        """Create database indexes"""
+        """Create database indexes and refresh the query planner statistics"""
         try:
-            with self.engine.connect() as conn:
-                indexes = [
-                    "CREATE INDEX IF NOT EXISTS idx_pollution_county ON raw_pollution(county)",
-                    "CREATE INDEX IF NOT EXISTS idx_pollution_year ON raw_pollution(year)",
-                    "CREATE INDEX IF NOT EXISTS idx_water_county ON raw_water_quality(county)",
-                    "CREATE INDEX IF NOT EXISTS idx_water_year ON raw_water_quality(year)",
-                    "CREATE INDEX IF NOT EXISTS idx_population_county ON raw_population(county)",
-                    "CREATE INDEX IF NOT EXISTS idx_population_year ON raw_population(year)"
-                ]
+            # (county, year) is the key every dataset is joined on; it also serves county-only lookups
+            indexes = [
+                # Single-column county indexes from older databases, superseded by the composite ones
+                "DROP INDEX IF EXISTS idx_pollution_county",
+                "DROP INDEX IF EXISTS idx_water_county",
+                "DROP INDEX IF EXISTS idx_population_county",
+                "CREATE INDEX IF NOT EXISTS idx_pollution_county_year ON raw_pollution(county, year)",
+                "CREATE INDEX IF NOT EXISTS idx_pollution_year ON raw_pollution(year)",
+                "CREATE INDEX IF NOT EXISTS idx_water_county_year ON raw_water_quality(county, year)",
+                "CREATE INDEX IF NOT EXISTS idx_water_year ON raw_water_quality(year)",
+                "CREATE INDEX IF NOT EXISTS idx_population_county_year ON raw_population(county, year)",
+                "CREATE INDEX IF NOT EXISTS idx_population_year ON raw_population(year)"
+            ]
+            script = "BEGIN;\n" + ";\n".join(indexes) + ";\nANALYZE;\nCOMMIT;"
+            
+            # Submit all statements in one executescript call on the underlying sqlite3 connection
+            raw_conn = self.engine.raw_connection()
+            try:
+                raw_conn.driver_connection.executescript(script)
+            finally:
+                raw_conn.close()
                 
-                for index_sql in indexes:
-                    conn.execute(text(index_sql))
-                    
-                conn.commit()
-                self.logger.info("Database indexes created")
+            self.logger.info("Database indexes created")
                 
-        except SQLAlchemyError as e:
+        except (SQLAlchemyError, sqlite3.Error) as e:
             self.logger.error(f"Error creating indexes: {str(e)}")
             raise
     
@@ -9,6 +9,95 @@ from src.constants import (
     AnalysisConstants
 )
 
+# (attribute, expected value) pairs for each column constants class
+_WQ_EXPECTED = (
+    ('SITE_CODE', 'site_code'),
+    ('COUNTY', 'county'),
+    ('CLASSIFICATION', 'classification'),
+    ('YEAR', 'year'),
+    ('QUALITY_SCORE', 'quality_score'),
+    ('IS_EXCELLENT', 'is_excellent'),
+    ('IS_GOOD_OR_BETTER', 'is_good_or_better'),
+    ('SITES_PER_COUNTY', 'sites_per_county'),
+    ('AVG_QUALITY_SCORE', 'avg_quality_score'),
+)
+
+_POLLUTION_EXPECTED = (
+    ('COUNTY', 'county'),
+    ('YEAR', 'year'),
+    ('POLLUTANT', 'pollutant'),
+    ('VALUE', 'value'),
+    ('TOTAL_EMISSIONS', 'total_emissions'),
+    ('CO2_EMISSIONS', 'co2_emissions'),
+    ('NOX_EMISSIONS', 'nox_emissions'),
+    ('PM25_EMISSIONS', 'pm25_emissions'),
+    ('POLLUTION_INDEX', 'pollution_index'),
+)
+
+_POPULATION_EXPECTED = (
+    ('COUNTY', 'county'),
+    ('YEAR', 'year'),
+    ('POPULATION', 'population'),
+    ('POPULATION_DENSITY', 'population_density'),
+    ('POPULATION_GROWTH', 'population_growth'),
+    ('POPULATION_GROWTH_TOTAL', 'population_growth_total'),
+)
+
+_INTEGRATED_EXPECTED = (
+    ('COUNTY', 'county'),
+    ('YEAR', 'year'),
+    ('TOTAL_EMISSIONS', 'total_emissions'),
+    ('POLLUTION_INDEX', 'pollution_index'),
+    ('CO2_EMISSIONS', 'co2_emissions'),
+    ('AVG_QUALITY_SCORE', 'avg_quality_score'),
+    ('SITES_PER_COUNTY', 'sites_per_county'),
+    ('PERCENT_EXCELLENT', 'percent_excellent'),
+    ('PERCENT_GOOD_OR_BETTER', 'percent_good_or_better'),
+    ('POPULATION', 'population'),
+    ('POPULATION_GROWTH', 'population_growth'),
+    ('POPULATION_DENSITY', 'population_density'),
+    ('EMISSIONS_PER_CAPITA', 'emissions_per_capita'),
+)
+
+_NUMERIC = (int, float)
+
+_SPECIFIC_COUNTIES = frozenset(('Dublin', 'Cork', 'Galway', 'Kerry', 'Mayo'))
+
+_AGG_EXPECTED = {
+    # Cork aggregation
+    'Cork City': 'Cork',
+    'Cork County': 'Cork',
+    # Galway aggregation
+    'Galway City': 'Galway',
+    'Galway County': 'Galway',
+    # Dublin aggregation
+    'Dublin City': 'Dublin',
+    'South Dublin': 'Dublin',
+    'Fingal': 'Dublin',
+    'Dún Laoghaire-Rathdown': 'Dublin',
+    # Direct mappings
+    'Limerick City and County': 'Limerick',
+    'Waterford City and County': 'Waterford',
+}
+
+_NORM_EXPECTED = {
+    # Cork - keeps city separate
+    'Cork City': 'Cork City',
+    'Cork County': 'Cork',
+    # Dublin - keeps city separate
+    'Dublin City': 'Dublin City',
+    'Dublin County': 'Dublin',
+    # Galway - keeps city separate
+    'Galway City': 'Galway City',
+    'Galway County': 'Galway',
+    # Combined entities
+    'Limerick City and County': 'Limerick',
+    'Waterford City and County': 'Waterford',
+    # Special cases
+    'Dún Laoghaire-Rathdown': 'Dún Laoghaire Rathdown',
+    'State': 'Ireland',
+}
+
 
 class TestTableNames(unittest.TestCase):
     """Test TableNames constants"""
@@ -31,15 +120,8 @@ class TestWaterQualityColumns(unittest.TestCase):
     
     def test_column_names_exist(self):
         """Test that all water quality column names are defined"""
-        self.assertEqual(WaterQualityColumns.SITE_CODE, 'site_code')
-        self.assertEqual(WaterQualityColumns.COUNTY, 'county')
-        self.assertEqual(WaterQualityColumns.CLASSIFICATION, 'classification')
-        self.assertEqual(WaterQualityColumns.YEAR, 'year')
-        self.assertEqual(WaterQualityColumns.QUALITY_SCORE, 'quality_score')
-        self.assertEqual(WaterQualityColumns.IS_EXCELLENT, 'is_excellent')
-        self.assertEqual(WaterQualityColumns.IS_GOOD_OR_BETTER, 'is_good_or_better')
-        self.assertEqual(WaterQualityColumns.SITES_PER_COUNTY, 'sites_per_county')
-        self.assertEqual(WaterQualityColumns.AVG_QUALITY_SCORE, 'avg_quality_score')
+        actual = {attr: getattr(WaterQualityColumns, attr) for attr, _ in _WQ_EXPECTED}
+        self.assertEqual(actual, dict(_WQ_EXPECTED))
 
 
 class TestPollutionColumns(unittest.TestCase):
@@ -47,15 +129,8 @@ class TestPollutionColumns(unittest.TestCase):
     
     def test_column_names_exist(self):
         """Test that all pollution column names are defined"""
-        self.assertEqual(PollutionColumns.COUNTY, 'county')
-        self.assertEqual(PollutionColumns.YEAR, 'year')
-        self.assertEqual(PollutionColumns.POLLUTANT, 'pollutant')
-        self.assertEqual(PollutionColumns.VALUE, 'value')
-        self.assertEqual(PollutionColumns.TOTAL_EMISSIONS, 'total_emissions')
-        self.assertEqual(PollutionColumns.CO2_EMISSIONS, 'co2_emissions')
-        self.assertEqual(PollutionColumns.NOX_EMISSIONS, 'nox_emissions')
-        self.assertEqual(PollutionColumns.PM25_EMISSIONS, 'pm25_emissions')
-        self.assertEqual(PollutionColumns.POLLUTION_INDEX, 'pollution_index')
+        actual = {attr: getattr(PollutionColumns, attr) for attr, _ in _POLLUTION_EXPECTED}
+        self.assertEqual(actual, dict(_POLLUTION_EXPECTED))
 
 
 class TestPopulationColumns(unittest.TestCase):
@@ -63,12 +138,8 @@ class TestPopulationColumns(unittest.TestCase):
     
     def test_column_names_exist(self):
         """Test that all population column names are defined"""
-        self.assertEqual(PopulationColumns.COUNTY, 'county')
-        self.assertEqual(PopulationColumns.YEAR, 'year')
-        self.assertEqual(PopulationColumns.POPULATION, 'population')
-        self.assertEqual(PopulationColumns.POPULATION_DENSITY, 'population_density')
-        self.assertEqual(PopulationColumns.POPULATION_GROWTH, 'population_growth')
-        self.assertEqual(PopulationColumns.POPULATION_GROWTH_TOTAL, 'population_growth_total')
+        actual = {attr: getattr(PopulationColumns, attr) for attr, _ in _POPULATION_EXPECTED}
+        self.assertEqual(actual, dict(_POPULATION_EXPECTED))
 
 
 class TestIntegratedColumns(unittest.TestCase):
@@ -76,19 +147,8 @@ class TestIntegratedColumns(unittest.TestCase):
     
     def test_column_names_exist(self):
         """Test that all integrated column names are defined"""
-        self.assertEqual(IntegratedColumns.COUNTY, 'county')
-        self.assertEqual(IntegratedColumns.YEAR, 'year')
-        self.assertEqual(IntegratedColumns.TOTAL_EMISSIONS, 'total_emissions')
-        self.assertEqual(IntegratedColumns.POLLUTION_INDEX, 'pollution_index')
-        self.assertEqual(IntegratedColumns.CO2_EMISSIONS, 'co2_emissions')
-        self.assertEqual(IntegratedColumns.AVG_QUALITY_SCORE, 'avg_quality_score')
-        self.assertEqual(IntegratedColumns.SITES_PER_COUNTY, 'sites_per_county')
-        self.assertEqual(IntegratedColumns.PERCENT_EXCELLENT, 'percent_excellent')
-        self.assertEqual(IntegratedColumns.PERCENT_GOOD_OR_BETTER, 'percent_good_or_better')
-        self.assertEqual(IntegratedColumns.POPULATION, 'population')
-        self.assertEqual(IntegratedColumns.POPULATION_GROWTH, 'population_growth')
-        self.assertEqual(IntegratedColumns.POPULATION_DENSITY, 'population_density')
-        self.assertEqual(IntegratedColumns.EMISSIONS_PER_CAPITA, 'emissions_per_capita')
+        actual = {attr: getattr(IntegratedColumns, attr) for attr, _ in _INTEGRATED_EXPECTED}
+        self.assertEqual(actual, dict(_INTEGRATED_EXPECTED))
     
     def test_inherited_columns_match(self):
         """Test that inherited columns match their source"""
@@ -110,29 +170,21 @@ class TestIrishCounties(unittest.TestCase):
         self.assertIsInstance(IrishCounties.COUNTY_AREAS, dict)
         self.assertGreater(len(IrishCounties.COUNTY_AREAS), 0)
     
-    def test_county_areas_are_numeric(self):
-        """Test that all county areas are numeric"""
-        for county, area in IrishCounties.COUNTY_AREAS.items():
-            self.assertIsInstance(county, str)
-            self.assertIsInstance(area, (int, float))
-            self.assertGreater(area, 0)
+    def test_county_areas_valid(self):
+        """Test that all county areas are numeric and within reasonable ranges (in km²)"""
+        bad = [(county, area) for county, area in IrishCounties.COUNTY_AREAS.items()
+               if not isinstance(county, str) or not isinstance(area, _NUMERIC)
+               or not 0 < area < 10000]
+        self.assertEqual(bad, [], f"Invalid county areas: {bad}")
     
     def test_specific_counties_exist(self):
         """Test that specific counties are in the dictionary"""
-        expected_counties = ['Dublin', 'Cork', 'Galway', 'Kerry', 'Mayo']
-        for county in expected_counties:
-            self.assertIn(county, IrishCounties.COUNTY_AREAS)
+        self.assertLessEqual(_SPECIFIC_COUNTIES, IrishCounties.COUNTY_AREAS.keys())
     
     def test_county_count(self):
         """Test that we have the expected number of counties"""
         self.assertEqual(len(IrishCounties.COUNTY_AREAS), 17)
     
-    def test_area_values_reasonable(self):
-        """Test that area values are within reasonable ranges (in km²)"""
-        for county, area in IrishCounties.COUNTY_AREAS.items():
-            self.assertGreater(area, 0, f"{county} area should be positive")
-            self.assertLess(area, 10000, f"{county} area seems too large")
-    
     def test_aggregation_mapping_exists(self):
         """Test that aggregation mapping dictionary exists"""
         self.assertIsInstance(IrishCounties.AGGREGATION_MAPPING, dict)
@@ -148,23 +200,8 @@ class TestIrishCounties(unittest.TestCase):
     
     def test_aggregation_mapping_specific_cases(self):
         """Test specific aggregation mapping cases"""
-        # Cork aggregation
-        self.assertEqual(IrishCounties.AGGREGATION_MAPPING['Cork City'], 'Cork')
-        self.assertEqual(IrishCounties.AGGREGATION_MAPPING['Cork County'], 'Cork')
-        
-        # Galway aggregation
-        self.assertEqual(IrishCounties.AGGREGATION_MAPPING['Galway City'], 'Galway')
-        self.assertEqual(IrishCounties.AGGREGATION_MAPPING['Galway County'], 'Galway')
-        
-        # Dublin aggregation
-        self.assertEqual(IrishCounties.AGGREGATION_MAPPING['Dublin City'], 'Dublin')
-        self.assertEqual(IrishCounties.AGGREGATION_MAPPING['South Dublin'], 'Dublin')
-        self.assertEqual(IrishCounties.AGGREGATION_MAPPING['Fingal'], 'Dublin')
-        self.assertEqual(IrishCounties.AGGREGATION_MAPPING['Dún Laoghaire-Rathdown'], 'Dublin')
-        
-        # Direct mappings
-        self.assertEqual(IrishCounties.AGGREGATION_MAPPING['Limerick City and County'], 'Limerick')
-        self.assertEqual(IrishCounties.AGGREGATION_MAPPING['Waterford City and County'], 'Waterford')
+        got = {k: IrishCounties.AGGREGATION_MAPPING[k] for k in _AGG_EXPECTED}
+        self.assertEqual(got, _AGG_EXPECTED)
     
     def test_normalization_mapping_exists(self):
         """Test that normalization mapping dictionary exists"""
@@ -181,25 +218,8 @@ class TestIrishCounties(unittest.TestCase):
     
     def test_normalization_mapping_specific_cases(self):
         """Test specific normalization mapping cases"""
-        # Cork - keeps city separate
-        self.assertEqual(IrishCounties.NORMALIZATION_MAPPING['Cork City'], 'Cork City')
-        self.assertEqual(IrishCounties.NORMALIZATION_MAPPING['Cork County'], 'Cork')
-        
-        # Dublin - keeps city separate
-        self.assertEqual(IrishCounties.NORMALIZATION_MAPPING['Dublin City'], 'Dublin City')
-        self.assertEqual(IrishCounties.NORMALIZATION_MAPPING['Dublin County'], 'Dublin')
-        
-        # Galway - keeps city separate
-        self.assertEqual(IrishCounties.NORMALIZATION_MAPPING['Galway City'], 'Galway City')
-        self.assertEqual(IrishCounties.NORMALIZATION_MAPPING['Galway County'], 'Galway')
-        
-        # Combined entities
-        self.assertEqual(IrishCounties.NORMALIZATION_MAPPING['Limerick City and County'], 'Limerick')
-        self.assertEqual(IrishCounties.NORMALIZATION_MAPPING['Waterford City and County'], 'Waterford')
-        
-        # Special cases
-        self.assertEqual(IrishCounties.NORMALIZATION_MAPPING['Dún Laoghaire-Rathdown'], 'Dún Laoghaire Rathdown')
-        self.assertEqual(IrishCounties.NORMALIZATION_MAPPING['State'], 'Ireland')
+        got = {k: IrishCounties.NORMALIZATION_MAPPING[k] for k in _NORM_EXPECTED}
+        self.assertEqual(got, _NORM_EXPECTED)
     
     def test_mapping_differences(self):
         """Test that aggregation and normalization mappings serve different purposes"""
@@ -224,10 +244,10 @@ class TestAnalysisConstants(unittest.TestCase):
     
     def test_thresholds_are_numeric(self):
         """Test that all thresholds are numeric"""
-        self.assertIsInstance(AnalysisConstants.EXCELLENT_THRESHOLD, (int, float))
-        self.assertIsInstance(AnalysisConstants.GOOD_THRESHOLD, (int, float))
-        self.assertIsInstance(AnalysisConstants.CORRELATION_THRESHOLD, (int, float))
-        self.assertIsInstance(AnalysisConstants.SIGNIFICANCE_LEVEL, (int, float))
+        self.assertIsInstance(AnalysisConstants.EXCELLENT_THRESHOLD, _NUMERIC)
+        self.assertIsInstance(AnalysisConstants.GOOD_THRESHOLD, _NUMERIC)
+        self.assertIsInstance(AnalysisConstants.CORRELATION_THRESHOLD, _NUMERIC)
+        self.assertIsInstance(AnalysisConstants.SIGNIFICANCE_LEVEL, _NUMERIC)
     
     def test_threshold_relationships(self):
         """Test that thresholds have logical relationships"""
@@ -4,36 +4,95 @@ Unit tests for DashboardVisualizer class
 
 import unittest
 import os
+import re
 import tempfile
-import shutil
+from unittest.mock import patch
+import numpy as np
 import pandas as pd
-from src.dashboard_visualizer import DashboardVisualizer
+import plotly.graph_objects as go
+from src.dashboard_visualizer import DashboardVisualizer, _load_template
 from src.analysis_results import AnalysisResults
 from tests.test_fixtures import TestDataGenerator
 
+_DASHBOARD_SECTIONS = frozenset((
+    'Ireland Environmental Data Analysis Dashboard',
+    'Water Quality',
+    'Pollution',
+    'Population',
+))
+
+_PVP_WIDGETS = frozenset((
+    'Population Growth per County',
+    'National Population Growth',
+    'Population-Pollution Correlation',
+))
+
+
+# Smoke tests only check that create() succeeds and writes a file, so they skip
+# serialising the figure; the shared render keeps the real to_html path covered
+_STUB_PLOTLY_HTML = patch.object(go.Figure, 'to_html', return_value='<div id="plotly-chart"></div>')
+
+
+def _marker_pattern(markers):
+    """Compile a single-pass pattern; the lookahead lets overlapping markers all match"""
+    return re.compile('(?=(%s))' % '|'.join(map(re.escape, markers)))
+
+
+_DASHBOARD_SECTIONS_RE = _marker_pattern(_DASHBOARD_SECTIONS)
+_PVP_WIDGETS_RE = _marker_pattern(_PVP_WIDGETS)
+
+_PVP_ANALYSIS = {
+    'census_years': [2011, 2016, 2022],
+    'overall_changes': {
+        'pollution_change_pct': 5.0,
+        'population_change_pct': 10.0,
+        'years_span': '2011-2022'
+    }
+}
+
+_PVW_ANALYSIS = {
+    'years_covered': [2021, 2022, 2023],
+    'pollution_water_correlation': {
+        'coefficient': -0.5,
+        'significant': True,
+        'interpretation': 'negative'
+    }
+}
+
+_INSIGHT_SUBSTRINGS = ('Multi-Dataset Integration Results', 'Census')
+
 
 class TestDashboardVisualizer(unittest.TestCase):
     """Test cases for DashboardVisualizer"""
     
-    def setUp(self):
-        """Set up test fixtures"""
-        # Create temporary output directory
-        self.temp_dir = tempfile.mkdtemp()
-        self.visualizer = DashboardVisualizer(output_dir=self.temp_dir)
-        
-        # Create sample analysis results using test fixtures
-        self.sample_integrated = TestDataGenerator.create_integrated_dataset()
-        self.sample_pollution = TestDataGenerator.create_pollution_time_series()
+    @classmethod
+    def setUpClass(cls):
+        """Build the read-only sample frames and render the shared dashboard once"""
+        cls._INTEGRATED_DF = TestDataGenerator.create_integrated_dataset()
+        cls._POLLUTION_DF = TestDataGenerator.create_pollution_time_series()
+        cls._CORRELATION_DF = TestDataGenerator.create_correlation_matrix()
         
-        self.sample_results = {
+        # Tests that only inspect the default dashboard share this render
+        shared_ctx = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(shared_ctx.cleanup)
+        cls._shared_dir = shared_ctx.name
+        cls._shared_output_file = os.path.join(cls._shared_dir, 'comprehensive_dashboard.html')
+        DashboardVisualizer(output_dir=cls._shared_dir).create(cls._build_results())
+        with open(cls._shared_output_file, 'r', encoding='utf-8') as f:
+            cls._shared_html = f.read()
+
+    @classmethod
+    def _build_results(cls):
+        """Wrap the cached sample frames in a fresh results dict"""
+        return {
             'processed_data': {
-                'integrated': self.sample_integrated,
-                'pollution': self.sample_pollution,
+                'integrated': cls._INTEGRATED_DF,
+                'pollution': cls._POLLUTION_DF,
                 'pollution_vs_population': pd.DataFrame(),
                 'pollution_vs_water': pd.DataFrame()
             },
             'correlations': {
-                'overall': TestDataGenerator.create_correlation_matrix(),
+                'overall': cls._CORRELATION_DF,
                 'pollution_water': pd.DataFrame()
             },
             'trends': {
@@ -44,22 +103,32 @@ class TestDashboardVisualizer(unittest.TestCase):
             'pollution_vs_population_analysis': {},
             'pollution_vs_water_analysis': {}
         }
+
+    def setUp(self):
+        """Set up test fixtures"""
+        # Create temporary output directory
+        self._tmp_ctx = tempfile.TemporaryDirectory()
+        self.temp_dir = self._tmp_ctx.name
+        self.visualizer = DashboardVisualizer(output_dir=self.temp_dir)
+        self.output_file = os.path.join(self.temp_dir, 'comprehensive_dashboard.html')
+        
+        # Tests only read the sample frames, so share the class-level copies
+        self.sample_integrated = self._INTEGRATED_DF
+        self.sample_pollution = self._POLLUTION_DF
+        
+        self.sample_results = self._build_results()
         
     def tearDown(self):
         """Clean up temporary directory"""
-        if os.path.exists(self.temp_dir):
-            shutil.rmtree(self.temp_dir)
+        self._tmp_ctx.cleanup()
             
     def test_create_dashboard_with_dict(self):
         """Test dashboard creation with dictionary input"""
-        # Should not raise an error
-        self.visualizer.create(self.sample_results)
+        # setUpClass rendered the dict input; check the output file was created
+        self.assertTrue(os.path.isfile(self._shared_output_file))
         
-        # Check output file is created
-        output_file = os.path.join(self.temp_dir, 'comprehensive_dashboard.html')
-        self.assertTrue(os.path.exists(output_file))
-        
-    def test_create_dashboard_with_dataclass(self):
+    @_STUB_PLOTLY_HTML
+    def test_create_dashboard_with_dataclass(self, _mock_to_html):
         """Test dashboard creation with AnalysisResults dataclass"""
         # Import dataclass components
         from src.analysis_results import ProcessedData, CorrelationData, CountyAnalysis
@@ -84,52 +153,35 @@ class TestDashboardVisualizer(unittest.TestCase):
         self.visualizer.create(results)
         
         # Check output file is created
-        output_file = os.path.join(self.temp_dir, 'comprehensive_dashboard.html')
-        self.assertTrue(os.path.exists(output_file))
+        self.assertTrue(os.path.isfile(self.output_file))
         
     def test_dashboard_html_structure(self):
         """Test dashboard HTML contains expected elements"""
-        self.visualizer.create(self.sample_results)
-        
-        output_file = os.path.join(self.temp_dir, 'comprehensive_dashboard.html')
-        
-        with open(output_file, 'r', encoding='utf-8') as f:
-            html_content = f.read()
-            
-        # Check for key elements
-        self.assertIn('Ireland Environmental Data Analysis Dashboard', html_content)
-        self.assertIn('Water Quality', html_content)
-        self.assertIn('Pollution', html_content)
-        self.assertIn('Population', html_content)
+        # Check for key elements in a single scan of the HTML
+        found = set(_DASHBOARD_SECTIONS_RE.findall(self._shared_html))
+        self.assertEqual(_DASHBOARD_SECTIONS - found, set())
         
+    def test_prepare_analysis_data_downcasts_plot_columns(self):
+        """Test plotted columns are downcast without mutating the caller's frames"""
+        analysis_dict = self.visualizer._prepare_analysis_data(self.sample_results)
+        integrated = analysis_dict['processed_data']['integrated']
+
+        self.assertEqual(integrated['avg_quality_score'].dtype, 'float32')
+        self.assertEqual(integrated['population'].dtype, 'int32')
+        self.assertEqual(self.sample_integrated['avg_quality_score'].dtype, 'float64')
+
     def test_create_analysis_insights_section(self):
         """Test creation of analysis insights section"""
-        pvp_analysis = {
-            'census_years': [2011, 2016, 2022],
-            'overall_changes': {
-                'pollution_change_pct': 5.0,
-                'population_change_pct': 10.0,
-                'years_span': '2011-2022'
-            }
-        }
-        
-        pvw_analysis = {
-            'years_covered': [2021, 2022, 2023],
-            'pollution_water_correlation': {
-                'coefficient': -0.5,
-                'significant': True,
-                'interpretation': 'negative'
-            }
-        }
-        
         # Should not raise an error
-        html = self.visualizer._create_analysis_insights_section(pvp_analysis, pvw_analysis, self.sample_results)
+        html = self.visualizer._create_analysis_insights_section(_PVP_ANALYSIS, _PVW_ANALYSIS, self.sample_results)
         
         # Check HTML contains expected content
-        self.assertIn('Multi-Dataset Integration Results', html)
-        self.assertIn('Census', html)
+        for text in _INSIGHT_SUBSTRINGS:
+            with self.subTest(text=text):
+                self.assertIn(text, html)
         
-    def test_empty_data_handling(self):
+    @_STUB_PLOTLY_HTML
+    def test_empty_data_handling(self, _mock_to_html):
         """Test handling of minimal datasets"""
         # Create minimal data with required columns
         minimal_integrated = TestDataGenerator.create_minimal_integrated_dataset()
@@ -155,8 +207,7 @@ class TestDashboardVisualizer(unittest.TestCase):
         # Should handle gracefully without crashing
         try:
             self.visualizer.create(minimal_results)
-            output_file = os.path.join(self.temp_dir, 'comprehensive_dashboard.html')
-            self.assertTrue(os.path.exists(output_file))
+            self.assertTrue(os.path.isfile(self.output_file))
         except Exception as e:
             self.fail(f"Dashboard creation failed with minimal data: {str(e)}")
     
@@ -181,7 +232,7 @@ class TestDashboardVisualizer(unittest.TestCase):
                 'pollution_vs_water': pd.DataFrame()
             },
             'correlations': {
-                'overall': TestDataGenerator.create_correlation_matrix(),
+                'overall': self._CORRELATION_DF,
                 'pollution_water': pd.DataFrame()
             },
             'trends': {
@@ -196,24 +247,16 @@ class TestDashboardVisualizer(unittest.TestCase):
         # Should create dashboard successfully with pvp data
         try:
             self.visualizer.create(results_with_pvp)
-            output_file = os.path.join(self.temp_dir, 'comprehensive_dashboard.html')
-            self.assertTrue(os.path.exists(output_file))
+            self.assertTrue(os.path.isfile(self.output_file))
             
-            # Verify the HTML contains population-related content
-            with open(output_file, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-            
-            # Check that population widgets are present
-            self.assertIn('Population Growth per County', html_content)
-            self.assertIn('National Population Growth', html_content)
-            self.assertIn('Population-Pollution Correlation', html_content)
+            # Check that population widgets are present in a single scan of the HTML
+            with open(self.output_file, 'r', encoding='utf-8') as f:
+                found = set(_PVP_WIDGETS_RE.findall(f.read()))
+            self.assertEqual(_PVP_WIDGETS - found, set())
             
         except Exception as e:
             self.fail(f"Dashboard creation failed with pollution_vs_population data: {str(e)}")
 
-
-if __name__ == '__main__':
-    unittest.main()
     def test_calculate_national_period_growth_correlation(self):
         """Test national period growth correlation calculation"""
         # Create sample data with pollution_vs_population dataset
@@ -244,7 +287,28 @@ if __name__ == '__main__':
         self.assertEqual(result['final_year'], 2022)
         
         # Population growth: (5M - 4.5M) / 4.5M * 100 = 11.11%
-        self.assertAlmostEqual(result['population_growth_pct'], 11.11, delta=0.1)
-        
         # Emission growth: (50K - 45K) / 45K * 100 = 11.11%
-        self.assertAlmostEqual(result['emission_growth_pct'], 11.11, delta=0.1)
\ No newline at end of file
+        np.testing.assert_allclose(
+            [result['population_growth_pct'], result['emission_growth_pct']],
+            [11.11, 11.11],
+            atol=0.1
+        )
+
+    def test_load_template_picks_up_created_and_edited_files(self):
+        """Test a template missing on first load, then created and edited, is read fresh each time"""
+        path = os.path.join(self.temp_dir, 'card.html')
+        self.assertIsNone(_load_template(path))
+
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('<p>{{TITLE}}</p>')
+        self.assertEqual(_load_template(path).substitute(TITLE='first'), '<p>first</p>')
+
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('<h3>{{TITLE}}</h3>')
+        mtime_ns = os.stat(path).st_mtime_ns + 1_000_000_000
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+        self.assertEqual(_load_template(path).substitute(TITLE='second'), '<h3>second</h3>')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,34 +3,60 @@ Unit tests for DataCollector class
 """
 
 import unittest
+import glob
+import json
+import os
+import tempfile
+import types
 from unittest.mock import patch, MagicMock
 import pandas as pd
-from src.data_collector import DataCollector
+import requests
+from src.data_collector import DataCollector, _HAS_PYARROW
+
+# Single-cell pollution cube; the %s placeholder takes the cell value
+_JSONSTAT_BODY = (b'{"dimension": {"TLIST(A1)": {"category": {"label": {"2021": "2021"}}}, '
+                  b'"C1": {"category": {"label": {"CO2": "CO2"}}}}, "value": [%s]}')
+
+_AGGREGATED_POPULATION = {
+    'Cork': 525000,  # 125000 + 400000
+    'Galway': 260000,  # 80000 + 180000
+    'Dublin': 1370000,  # 550000 + 280000 + 320000 + 220000
+    'Limerick': 195000,
+    'Waterford': 116000,
+    'Kerry': 147000,
+}
 
 
 class TestDataCollector(unittest.TestCase):
     """Test cases for DataCollector"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Build the empty JSON-stat response shared by the API success tests"""
+        cls._empty_response = types.SimpleNamespace(
+            status_code=200, headers={}, content=b'{"dimension": {}, "value": []}'
+        )
+
     def setUp(self):
-        """Set up test fixtures"""
-        self.collector = DataCollector()
+        """Set up test fixtures with a temporary response cache"""
+        self._cache_ctx = tempfile.TemporaryDirectory()
+        self.cache_dir = self._cache_ctx.name
+        self.collector = DataCollector(cache_dir=self.cache_dir)
         
-    @patch('src.data_collector.requests.get')
+    def tearDown(self):
+        """Clean up temporary response cache"""
+        self._cache_ctx.cleanup()
+        
+    @patch('src.data_collector.requests.Session.get')
     def test_collect_pollution_data_success(self, mock_get):
         """Test successful pollution data fetch"""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            'dimension': {},
-            'value': []
-        }
-        mock_get.return_value = mock_response
+        mock_get.return_value = self._empty_response
         
         result = self.collector._collect_pollution_data()
         
         self.assertIsInstance(result, pd.DataFrame)
         
-    @patch('src.data_collector.requests.get')
+    @patch('src.data_collector.requests.Session.get')
     def test_collect_pollution_data_fallback(self, mock_get):
         """Test pollution data fallback on API failure"""
         mock_get.side_effect = Exception("API Error")
@@ -40,36 +66,66 @@ class TestDataCollector(unittest.TestCase):
         self.assertIsInstance(result, pd.DataFrame)
         self.assertGreater(len(result), 0)
         
-    @patch('src.data_collector.requests.get')
+    @patch('src.data_collector.requests.Session.get')
     def test_collect_water_quality_data_success(self, mock_get):
         """Test successful water quality data fetch"""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            'dimension': {},
-            'value': []
-        }
-        mock_get.return_value = mock_response
+        mock_get.return_value = self._empty_response
         
         result = self.collector._collect_water_quality_data()
         
         self.assertIsInstance(result, pd.DataFrame)
         
-    @patch('src.data_collector.requests.get')
+    @patch('src.data_collector.requests.Session.get')
+    def test_collect_water_quality_data_csv_fallback(self, mock_get):
+        """Test CSV export is used with typed columns when JSON-stat has no data"""
+        json_response = MagicMock(status_code=200, headers={}, content=b'{"dimension": {}, "value": []}')
+        csv_response = MagicMock(status_code=200, headers={}, content=b'Year,County,Classification,VALUE\n2021,Cork,Good,3\n')
+        mock_get.side_effect = [json_response, csv_response]
+        
+        result = self.collector._collect_water_quality_data()
+        
+        self.assertEqual(list(result['county']), ['Cork'])
+        self.assertIsInstance(result['classification'].dtype, pd.CategoricalDtype)
+        self.assertEqual(result['VALUE'].dtype, 'float64')
+        
+    @patch('src.data_collector.requests.Session.get')
     def test_collect_population_data_success(self, mock_get):
         """Test successful population data fetch"""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            'dimension': {},
-            'value': []
-        }
-        mock_get.return_value = mock_response
+        mock_get.return_value = self._empty_response
         
         result = self.collector._collect_population_data()
         
         self.assertIsInstance(result, pd.DataFrame)
         
+    def test_collect_population_data_from_census_cubes(self):
+        """Test census records from every cube are combined into one typed frame"""
+        cubes = {
+            'E2011': {
+                'dimension': {
+                    'STATISTIC': {'label': 'Statistic', 'category': {'label': {'P': 'Population'}}},
+                    'TLIST(A1)': {'label': 'Census Year', 'category': {'label': {'2011': '2011', '2016': '2016'}}},
+                    'C1': {'label': 'County', 'category': {'label': {'IE': 'State', 'KY': 'Kerry'}}}
+                },
+                'value': [4588252, 145502, 4761865, 147707]
+            },
+            'G0420': {
+                'dimension': {
+                    'STATISTIC': {'label': 'Statistic', 'category': {'label': {'P': 'Population per County 2022'}}},
+                    'C2': {'label': 'County', 'category': {'label': {'KY': 'Co. Kerry', 'DC': 'Dublin City'}}}
+                },
+                'value': [156458, 592713]
+            }
+        }
+        
+        with patch.object(self.collector, '_fetch_census_cube', side_effect=lambda code: cubes[code]):
+            result = self.collector._collect_population_data()
+        
+        self.assertEqual(list(result['year']), [2016, 2011, 2022])
+        self.assertEqual(list(result['county']), ['Ireland', 'Kerry', 'Kerry'])
+        self.assertEqual(list(result['population']), [4761865, 145502, 156458])
+        self.assertEqual(result['year'].dtype, 'int16')
+        self.assertIsInstance(result['county'].dtype, pd.CategoricalDtype)
+        
     def test_collect_all_datasets(self):
         """Test collecting all datasets"""
         datasets = self.collector.collect_all_datasets()
@@ -86,7 +142,7 @@ class TestDataCollector(unittest.TestCase):
         
     def test_fallback_data_structure(self):
         """Test fallback data has correct structure"""
-        with patch('src.data_collector.requests.get', side_effect=Exception("API Error")):
+        with patch('src.data_collector.requests.Session.get', side_effect=Exception("API Error")):
             datasets = self.collector.collect_all_datasets()
             
             # Check pollution data structure
@@ -95,7 +151,109 @@ class TestDataCollector(unittest.TestCase):
             self.assertIn('year', pollution.columns)
             self.assertIn('pollutant', pollution.columns)
             self.assertIn('value', pollution.columns)
-    
+            self.assertIsInstance(pollution['county'].dtype, pd.CategoricalDtype)
+            self.assertEqual(pollution['year'].dtype, 'int16')
+
+            # Water quality classes are ordered from Poor to Excellent
+            classification = datasets['raw_water_quality']['classification']
+            self.assertTrue(classification.cat.ordered)
+            self.assertEqual(list(classification.cat.categories), ['Poor', 'Sufficient', 'Good', 'Excellent'])
+
+    @patch('src.data_collector.requests.Session.get')
+    def test_cached_get_revalidates_with_etag(self, mock_get):
+        """Test cached body is served when the server answers 304 Not Modified"""
+        url = 'https://example.com/EAA20'
+        fresh = MagicMock(status_code=200, headers={'ETag': '"v1"'}, content=b'payload')
+        not_modified = MagicMock(status_code=304, headers={}, content=b'')
+        mock_get.side_effect = [fresh, not_modified]
+        
+        self.assertEqual(self.collector._cached_get(url, timeout=30), b'payload')
+        self.assertEqual(self.collector._cached_get(url, timeout=30), b'payload')
+        
+        self.assertEqual(mock_get.call_args.kwargs['headers'], {'If-None-Match': '"v1"'})
+        
+    @patch('src.data_collector.requests.Session.get')
+    def test_cached_get_stores_body_and_validators_as_plain_files(self, mock_get):
+        """Test a cached response is a raw body file plus a JSON sidecar of its validators"""
+        url = 'https://example.com/EAA20'
+        mock_get.return_value = MagicMock(status_code=200, headers={'ETag': '"v1"'}, content=b'payload')
+        
+        self.collector._cached_get(url, timeout=30)
+        
+        cache_path = self.collector._cache_path(url)
+        with open(f"{cache_path}.body", 'rb') as f:
+            self.assertEqual(f.read(), b'payload')
+        with open(f"{cache_path}.json", 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f), {'etag': '"v1"', 'last_modified': None})
+        
+    @patch('src.data_collector.requests.Session.get')
+    def test_cached_get_serves_stale_body_on_network_error(self, mock_get):
+        """Test cached body is served when the server cannot be reached"""
+        url = 'https://example.com/EAA20'
+        fresh = MagicMock(status_code=200, headers={'ETag': '"v1"'}, content=b'payload')
+        mock_get.side_effect = [fresh, requests.ConnectionError("unreachable")]
+        
+        self.assertEqual(self.collector._cached_get(url, timeout=30), b'payload')
+        self.assertEqual(self.collector._cached_get(url, timeout=30), b'payload')
+        
+    def test_parse_cso_jsonstat(self):
+        """Test JSON-stat cube is decoded row-major with null cells dropped"""
+        data = {
+            'dimension': {
+                'STATISTIC': {'category': {'label': {'EAA20C01': 'Air Emissions'}}},
+                'TLIST(A1)': {'category': {'label': {'2021': '2021', '2022': '2022'}}},
+                'C03904V04656': {'category': {'label': {'CO2': 'CO2', 'NOx': 'NOx'}}}
+            },
+            'value': [100, None, 110, 66532458]
+        }
+
+        result = self.collector._parse_cso_jsonstat(data, 'pollution')
+
+        self.assertEqual(list(result.columns), ['statistic', 'year', 'pollutant', 'value'])
+        self.assertEqual(list(result['year']), [2021, 2022, 2022])
+        self.assertEqual(result['year'].dtype, 'int16')
+        self.assertIsInstance(result['pollutant'].dtype, pd.CategoricalDtype)
+        self.assertEqual(list(result['pollutant']), ['CO2', 'CO2', 'NOx'])
+        self.assertEqual(result['value'].dtype, 'float64')
+        self.assertEqual(list(result['value']), [100, 110, 66532458])
+
+    def test_parse_cso_jsonstat_skips_status_symbol_cells(self):
+        """Test non-numeric cells such as the CSO '..' symbol are dropped instead of failing the cube"""
+        data = {
+            'dimension': {
+                'TLIST(A1)': {'category': {'label': {'2021': '2021', '2022': '2022'}}},
+                'C03904V04656': {'category': {'label': {'CO2': 'CO2', 'NOx': 'NOx'}}}
+            },
+            'value': [100, '..', 110, 120]
+        }
+
+        result = self.collector._parse_cso_jsonstat(data, 'pollution')
+
+        self.assertEqual(list(result['year']), [2021, 2022, 2022])
+        self.assertEqual(list(result['pollutant']), ['CO2', 'CO2', 'NOx'])
+        self.assertEqual(list(result['value']), [100, 110, 120])
+
+    @unittest.skipUnless(_HAS_PYARROW, "parsed frames are only cached when pyarrow is installed")
+    def test_parse_cso_body_reuses_cached_frame(self):
+        """Test an unchanged response body is parsed only once"""
+        body = _JSONSTAT_BODY % b'100'
+        
+        first = self.collector._parse_cso_body(body, 'pollution')
+        with patch.object(self.collector, '_parse_cso_jsonstat') as mock_parse:
+            second = self.collector._parse_cso_body(body, 'pollution')
+        
+        mock_parse.assert_not_called()
+        pd.testing.assert_frame_equal(first, second)
+
+    @unittest.skipUnless(_HAS_PYARROW, "parsed frames are only cached when pyarrow is installed")
+    def test_parse_cso_body_replaces_frame_when_body_changes(self):
+        """Test only the latest parsed frame of a dataset type is kept on disk"""
+        self.collector._parse_cso_body(_JSONSTAT_BODY % b'100', 'pollution')
+        result = self.collector._parse_cso_body(_JSONSTAT_BODY % b'200', 'pollution')
+        
+        self.assertEqual(list(result['value']), [200])
+        self.assertEqual(len(glob.glob(os.path.join(self.cache_dir, 'pollution.*'))), 1)
+
     def test_aggregate_city_county_pairs(self):
         """Test county aggregation functionality"""
         # Test data with city/county pairs
@@ -115,44 +273,10 @@ class TestDataCollector(unittest.TestCase):
         
         result = self.collector._aggregate_city_county_pairs(test_records)
         
-        # Convert to dict for easier testing
+        # City/county pairs collapse into one entry per county; nothing else survives
         result_dict = {record['county']: record['population'] for record in result}
-        
-        # Test Cork aggregation
-        self.assertIn('Cork', result_dict)
-        self.assertEqual(result_dict['Cork'], 525000)  # 125000 + 400000
-        self.assertNotIn('Cork City', result_dict)
-        self.assertNotIn('Cork County', result_dict)
-        
-        # Test Galway aggregation
-        self.assertIn('Galway', result_dict)
-        self.assertEqual(result_dict['Galway'], 260000)  # 80000 + 180000
-        self.assertNotIn('Galway City', result_dict)
-        self.assertNotIn('Galway County', result_dict)
-        
-        # Test Dublin aggregation
-        self.assertIn('Dublin', result_dict)
-        self.assertEqual(result_dict['Dublin'], 1370000)  # 550000 + 280000 + 320000 + 220000
-        self.assertNotIn('Dublin City', result_dict)
-        self.assertNotIn('South Dublin', result_dict)
-        self.assertNotIn('Fingal', result_dict)
-        self.assertNotIn('Dún Laoghaire-Rathdown', result_dict)
-        
-        # Test direct mappings
-        self.assertIn('Limerick', result_dict)
-        self.assertEqual(result_dict['Limerick'], 195000)
-        self.assertNotIn('Limerick City and County', result_dict)
-        
-        self.assertIn('Waterford', result_dict)
-        self.assertEqual(result_dict['Waterford'], 116000)
-        self.assertNotIn('Waterford City and County', result_dict)
-        
-        # Test unchanged county
-        self.assertIn('Kerry', result_dict)
-        self.assertEqual(result_dict['Kerry'], 147000)
-        
-        # Test total number of aggregated records
-        self.assertEqual(len(result), 6)  # Cork, Galway, Dublin, Limerick, Waterford, Kerry
+        self.assertEqual(result_dict, _AGGREGATED_POPULATION)
+        self.assertEqual(len(result), len(_AGGREGATED_POPULATION))
     
     def test_aggregate_city_county_pairs_empty_input(self):
         """Test aggregation with empty input"""
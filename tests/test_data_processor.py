@@ -9,105 +9,144 @@ from src.data_processor import DataProcessor
 from src.constants import WaterQualityColumns, PollutionColumns, PopulationColumns
 from tests.test_fixtures import TestDataGenerator
 
+# Columns each processing step must add to its output
+_POLLUTION_OUTPUT_COLUMNS = frozenset(
+    {'data_type', PollutionColumns.TOTAL_EMISSIONS, PollutionColumns.POLLUTION_INDEX}
+)
+_WATER_OUTPUT_COLUMNS = frozenset(
+    {WaterQualityColumns.AVG_QUALITY_SCORE, 'percent_excellent', 'percent_good_or_better'}
+)
+_POPULATION_OUTPUT_COLUMNS = frozenset(
+    {PopulationColumns.POPULATION_DENSITY, PopulationColumns.POPULATION_GROWTH,
+     PopulationColumns.POPULATION_GROWTH_TOTAL}
+)
+
+# (raw county name, normalized name) pairs for _normalize_county_name
+_COUNTY_NAME_CASES = (
+    # Prefixes and suffixes are removed
+    ('Co. Cork', 'Cork'),
+    ('Dublin City Council', 'Dublin'),
+    ('Galway County Council', 'Galway'),
+    # Cork, Dublin and Galway keep the city separate; the county becomes the main entry
+    ('Cork City', 'Cork City'),
+    ('Cork County', 'Cork'),
+    ('Dublin City', 'Dublin City'),
+    ('Dublin County', 'Dublin'),
+    ('Galway City', 'Galway City'),
+    ('Galway County', 'Galway'),
+    # Combined city/county entities
+    ('Limerick City and County', 'Limerick'),
+    ('Waterford City and County', 'Waterford'),
+    # Special cases
+    ('State', 'Ireland'),
+    ('Dún Laoghaire-Rathdown', 'Dún Laoghaire Rathdown'),
+    # ' City' suffix is removed for non-preserved cities
+    ('Kilkenny City', 'Kilkenny'),
+    # Unchanged counties
+    ('Kerry', 'Kerry'),
+    ('Mayo', 'Mayo'),
+    # NaN, empty string and whitespace handling
+    (np.nan, np.nan),
+    ('', ''),
+    ('  Cork  ', 'Cork'),
+)
+
 
 class TestDataProcessor(unittest.TestCase):
     """Test cases for DataProcessor"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Build the raw sample frames once; tests copy them before mutating"""
+        cls._NATIONAL_POLLUTION = TestDataGenerator.create_national_pollution_data()
+        cls._DETAILED_WATER = TestDataGenerator.create_detailed_water_quality_data()
+        cls._DETAILED_POPULATION = TestDataGenerator.create_detailed_population_data()
+
     def setUp(self):
         """Set up test fixtures"""
         self.processor = DataProcessor()
         
     def test_normalize_county_name(self):
         """Test county name normalization using centralized mapping"""
-        # Test removing prefixes and suffixes
-        self.assertEqual(self.processor._normalize_county_name('Co. Cork'), 'Cork')
-        self.assertEqual(self.processor._normalize_county_name('Dublin City Council'), 'Dublin')
-        self.assertEqual(self.processor._normalize_county_name('Galway County Council'), 'Galway')
-        
-        # Test centralized normalization mapping
-        # Cork - keeps city separate, county becomes main entry
-        self.assertEqual(self.processor._normalize_county_name('Cork City'), 'Cork City')
-        self.assertEqual(self.processor._normalize_county_name('Cork County'), 'Cork')
-        
-        # Dublin - keeps city separate, county becomes main entry
-        self.assertEqual(self.processor._normalize_county_name('Dublin City'), 'Dublin City')
-        self.assertEqual(self.processor._normalize_county_name('Dublin County'), 'Dublin')
-        
-        # Galway - keeps city separate, county becomes main entry
-        self.assertEqual(self.processor._normalize_county_name('Galway City'), 'Galway City')
-        self.assertEqual(self.processor._normalize_county_name('Galway County'), 'Galway')
-        
-        # Combined city/county entities
-        self.assertEqual(self.processor._normalize_county_name('Limerick City and County'), 'Limerick')
-        self.assertEqual(self.processor._normalize_county_name('Waterford City and County'), 'Waterford')
-        
-        # Special cases
-        self.assertEqual(self.processor._normalize_county_name('State'), 'Ireland')
-        self.assertEqual(self.processor._normalize_county_name('Dún Laoghaire-Rathdown'), 'Dún Laoghaire Rathdown')
-        
-        # Test removing ' City' suffix for non-preserved cities
-        self.assertEqual(self.processor._normalize_county_name('Kilkenny City'), 'Kilkenny')
+        inputs, expected = zip(*_COUNTY_NAME_CASES)
         
-        # Test unchanged counties
-        self.assertEqual(self.processor._normalize_county_name('Kerry'), 'Kerry')
-        self.assertEqual(self.processor._normalize_county_name('Mayo'), 'Mayo')
+        actual = pd.Series(inputs, dtype=object).map(self.processor._normalize_county_name)
         
-        # Test NaN handling
-        self.assertTrue(pd.isna(self.processor._normalize_county_name(np.nan)))
-        
-        # Test empty string handling
-        self.assertEqual(self.processor._normalize_county_name(''), '')
-        
-        # Test whitespace handling
-        self.assertEqual(self.processor._normalize_county_name('  Cork  '), 'Cork')
+        pd.testing.assert_series_equal(actual, pd.Series(expected, dtype=object), check_dtype=False)
         
     def test_process_pollution_data_national(self):
         """Test processing national-level pollution data"""
         # Create sample national pollution data
-        df = TestDataGenerator.create_national_pollution_data()
+        df = self._NATIONAL_POLLUTION
         
         result = self.processor._process_pollution_data(df)
         
-        # Check that data_type is set to national
-        self.assertTrue('data_type' in result.columns)
-        self.assertEqual(result['data_type'].iloc[0], 'national')
-        
-        # Check that total_emissions is calculated
-        self.assertTrue(PollutionColumns.TOTAL_EMISSIONS in result.columns)
-        
-        # Check that pollution_index is calculated
-        self.assertTrue(PollutionColumns.POLLUTION_INDEX in result.columns)
+        # Check that data_type, total_emissions and pollution_index are set
+        self.assertLessEqual(_POLLUTION_OUTPUT_COLUMNS, set(result.columns))
+        self.assertEqual(result['data_type'].iat[0], 'national')
         
     def test_process_water_quality_data(self):
         """Test processing water quality data"""
         # Create sample water quality data
-        df = TestDataGenerator.create_detailed_water_quality_data()
+        df = self._DETAILED_WATER
         
         result = self.processor._process_water_quality_data(df)
         
         # Check county names are normalized
-        self.assertIn('Cork', result[WaterQualityColumns.COUNTY].values)
-        self.assertIn('Dublin', result[WaterQualityColumns.COUNTY].values)
+        self.assertLessEqual({'Cork', 'Dublin'}, set(result[WaterQualityColumns.COUNTY].unique()))
         
         # Check aggregated columns exist
-        self.assertTrue(WaterQualityColumns.AVG_QUALITY_SCORE in result.columns)
-        self.assertTrue('percent_excellent' in result.columns)
-        self.assertTrue('percent_good_or_better' in result.columns)
+        self.assertLessEqual(_WATER_OUTPUT_COLUMNS, set(result.columns))
+        
+    def test_process_water_quality_data_scores_classifications(self):
+        """Test classifications map to scores 1-4 and unknown classes are left unscored"""
+        df = pd.DataFrame({
+            'county': ['Cork', 'Cork', 'Cork', 'Kerry', 'Kerry'],
+            'year': [2022, 2022, 2022, 2022, 2022],
+            'classification': ['Excellent', 'Poor', 'Sufficient', 'Good', 'Unclassified']
+        })
+        
+        result = self.processor._process_water_quality_data(df).set_index('county')
+        
+        self.assertAlmostEqual(result.loc['Cork', WaterQualityColumns.AVG_QUALITY_SCORE], 7 / 3)
+        self.assertAlmostEqual(result.loc['Kerry', WaterQualityColumns.AVG_QUALITY_SCORE], 3)
+        
+    def test_process_water_quality_data_leaves_input_unchanged(self):
+        """Test processing works on a shallow copy without mutating the caller's frame"""
+        df = self._DETAILED_WATER
+        original = df.copy()
+        
+        self.processor._process_water_quality_data(df)
+        
+        pd.testing.assert_frame_equal(df, original)
         
     def test_process_population_data(self):
         """Test processing population data"""
         # Create sample population data
-        df = TestDataGenerator.create_detailed_population_data()
+        df = self._DETAILED_POPULATION
         
         result = self.processor._process_population_data(df)
         
-        # Check population density is calculated
-        self.assertTrue(PopulationColumns.POPULATION_DENSITY in result.columns)
-        
-        # Check growth metrics are calculated
-        self.assertTrue(PopulationColumns.POPULATION_GROWTH in result.columns)
-        self.assertTrue(PopulationColumns.POPULATION_GROWTH_TOTAL in result.columns)
-        
+        # Check population density and growth metrics are calculated
+        self.assertLessEqual(_POPULATION_OUTPUT_COLUMNS, set(result.columns))
+
+    def test_process_population_data_skips_missing_first_year(self):
+        """Test total growth is measured from a county's first known population"""
+        df = pd.DataFrame({
+            PopulationColumns.COUNTY: ['Cork', 'Cork', 'Dublin', 'Dublin'],
+            PopulationColumns.YEAR: [2011, 2022, 2011, 2022],
+            PopulationColumns.POPULATION: [np.nan, 550000, 1200000, 1320000],
+            'census_year': [2011, 2022, 2011, 2022],
+            'statistic': ['Population per County'] * 4
+        })
+
+        result = self.processor._process_population_data(df)
+
+        latest = result[result[PopulationColumns.YEAR] == 2022].set_index(PopulationColumns.COUNTY)
+        growth_total = latest[PopulationColumns.POPULATION_GROWTH_TOTAL]
+        self.assertAlmostEqual(growth_total['Cork'], 0.0)
+        self.assertAlmostEqual(growth_total['Dublin'], 10.0)
+
     def test_add_estimated_county_emissions(self):
         """Test calculation of estimated county emissions"""
         # Create sample population data with census_year column
@@ -133,16 +172,44 @@ class TestDataProcessor(unittest.TestCase):
         self.assertTrue('estimated_county_emissions' in result.columns)
         
         # Check calculation is correct (proportional to population)
-        cork_row = result[result['county'] == 'Cork']
-        dublin_row = result[result['county'] == 'Dublin']
+        by_county = result.drop_duplicates('county').set_index('county')['estimated_county_emissions']
+        cork_emissions = by_county.get('Cork')
+        dublin_emissions = by_county.get('Dublin')
         
-        if not cork_row.empty and not dublin_row.empty:
-            cork_emissions = cork_row['estimated_county_emissions'].iloc[0]
-            dublin_emissions = dublin_row['estimated_county_emissions'].iloc[0]
-            
+        if cork_emissions is not None and dublin_emissions is not None:
             # Cork should have ~10% of emissions (500k/1.7M), Dublin ~24% (1.2M/1.7M)
             self.assertGreater(dublin_emissions, cork_emissions)
 
+    def test_reduce_pollution_chunks_matches_unchunked_pivot(self):
+        """Test pre-aggregating pollution in chunks gives the same pivot as the full table"""
+        df = pd.concat([self._NATIONAL_POLLUTION] * 2, ignore_index=True)
+        chunks = (df.iloc[start:start + 3] for start in range(0, len(df), 3))
+        
+        reduced = self.processor._reduce_pollution_chunks(chunks)
+        
+        pd.testing.assert_frame_equal(
+            self.processor._process_pollution_data(reduced),
+            self.processor._process_pollution_data(df)
+        )
+
+    def test_create_integrated_dataset_median_fill_keeps_float32(self):
+        """Test the median fill keeps a float32 column in float32"""
+        water = self.processor._process_water_quality_data(self._DETAILED_WATER.copy())
+        water = water.astype({WaterQualityColumns.AVG_QUALITY_SCORE: 'float32'})
+        water.loc[water.index[0], WaterQualityColumns.AVG_QUALITY_SCORE] = np.nan
+        processed = {
+            'pollution': self.processor._process_pollution_data(self._NATIONAL_POLLUTION.copy())
+                .drop(columns=PollutionColumns.POLLUTION_INDEX),
+            'water_quality': water,
+            'population': self.processor._process_population_data(self._DETAILED_POPULATION.copy()),
+        }
+
+        integrated = self.processor._create_integrated_dataset(processed)
+
+        scores = integrated[WaterQualityColumns.AVG_QUALITY_SCORE]
+        self.assertEqual(scores.dtype, np.float32)
+        self.assertFalse(scores.isna().any())
+
 
 if __name__ == '__main__':
     unittest.main()
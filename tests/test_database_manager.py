@@ -3,8 +3,6 @@ Unit tests for DatabaseManager class
 """
 
 import unittest
-import os
-import tempfile
 import pandas as pd
 from src.database_manager import DatabaseManager
 from src.constants import TableNames
@@ -14,84 +12,110 @@ from tests.test_fixtures import TestDataGenerator
 class TestDatabaseManager(unittest.TestCase):
     """Test cases for DatabaseManager"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Build the sample datasets and results once; storing and loading never mutates them"""
+        cls.sample_pollution = TestDataGenerator.create_sample_pollution_data()
+        cls.sample_water = TestDataGenerator.create_sample_water_quality_data()
+        cls.sample_population = TestDataGenerator.create_sample_population_data()
+        cls.sample_results = {
+            'correlations': {'overall': pd.DataFrame({'A': [1, 2], 'B': [3, 4]})},
+            'statistics': {'descriptive': pd.DataFrame({'mean': [1.5], 'std': [0.5]})},
+            'trends': {'annual_means': pd.DataFrame({'year': [2022], 'value': [100]})},
+            'processed_data': {
+                'integrated': pd.DataFrame({'county': ['Cork'], 'year': [2022]})
+            }
+        }
+
     def setUp(self):
-        """Set up test fixtures with temporary database"""
-        # Create temporary database file
-        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
-        self.temp_db.close()
-        
-        # Initialize database manager with temp database
-        self.db_manager = DatabaseManager(db_path=self.temp_db.name)
-        
-        # Create sample datasets using test fixtures
-        self.sample_pollution = TestDataGenerator.create_sample_pollution_data()
-        self.sample_water = TestDataGenerator.create_sample_water_quality_data()
-        self.sample_population = TestDataGenerator.create_sample_population_data()
+        """Set up test fixtures with a private in-memory database"""
+        self.db_manager = DatabaseManager(db_path=':memory:')
         
     def tearDown(self):
-        """Clean up temporary database"""
-        if os.path.exists(self.temp_db.name):
-            os.unlink(self.temp_db.name)
+        """Release the in-memory database"""
+        self.db_manager.engine.dispose()
             
-    def test_store_and_load_pollution_data(self):
-        """Test storing and loading pollution data"""
-        # Store data with correct table names
-        datasets = {
-            TableNames.RAW_POLLUTION: self.sample_pollution,
-            TableNames.RAW_WATER_QUALITY: self.sample_water,
-            TableNames.RAW_POPULATION: self.sample_population
+    def test_store_and_load_datasets(self):
+        """Test storing all raw datasets once and loading each back"""
+        expected = {
+            TableNames.RAW_POLLUTION: (self.sample_pollution, {'county', 'year'}),
+            TableNames.RAW_WATER_QUALITY: (self.sample_water, {'county'}),
+            TableNames.RAW_POPULATION: (self.sample_population, {'population'})
         }
-        self.db_manager.store_datasets(datasets)
+        self.db_manager.store_datasets({name: df for name, (df, _) in expected.items()})
+        
+        for table_name, (sample, columns) in expected.items():
+            with self.subTest(table=table_name):
+                loaded = self.db_manager.load_dataset(table_name)
+                
+                # Check data is loaded correctly
+                self.assertEqual(len(loaded), len(sample))
+                self.assertLessEqual(columns, set(loaded.columns))
+        
+    def test_store_analysis_results(self):
+        """Test storing analysis results"""
+        # Should not raise an error
+        self.db_manager.store_analysis_results(self.sample_results)
         
-        # Load data
-        loaded = self.db_manager.load_dataset(TableNames.RAW_POLLUTION)
+    def test_store_datasets_is_atomic(self):
+        """Test a failing table write rolls back the tables stored before it"""
+        unstorable = pd.DataFrame({'county': ['Cork'], 'value': [{'not': 'storable'}]})
         
-        # Check data is loaded correctly
+        with self.assertRaises(Exception):
+            self.db_manager.store_datasets({
+                TableNames.RAW_POLLUTION: self.sample_pollution,
+                TableNames.RAW_WATER_QUALITY: unstorable
+            })
+        
+        with self.assertRaises(Exception):
+            self.db_manager.load_dataset(TableNames.RAW_POLLUTION)
+        
+    def test_load_dataset_selected_columns(self):
+        """Test loading only the requested columns of a dataset"""
+        self.db_manager.store_datasets({TableNames.RAW_POLLUTION: self.sample_pollution})
+        
+        loaded = self.db_manager.load_dataset(TableNames.RAW_POLLUTION, columns=['county', 'value'])
+        
+        self.assertEqual(list(loaded.columns), ['county', 'value'])
         self.assertEqual(len(loaded), len(self.sample_pollution))
-        self.assertIn('county', loaded.columns)
-        self.assertIn('year', loaded.columns)
         
-    def test_store_and_load_water_quality_data(self):
-        """Test storing and loading water quality data"""
-        datasets = {
-            TableNames.RAW_POLLUTION: self.sample_pollution,
-            TableNames.RAW_WATER_QUALITY: self.sample_water,
-            TableNames.RAW_POPULATION: self.sample_population
-        }
-        self.db_manager.store_datasets(datasets)
+    def test_load_dataset_chunks(self):
+        """Test loading a dataset in chunks returns every row"""
+        self.db_manager.store_datasets({TableNames.RAW_POLLUTION: self.sample_pollution})
         
-        loaded = self.db_manager.load_dataset(TableNames.RAW_WATER_QUALITY)
+        chunks = list(self.db_manager.load_dataset_chunks(TableNames.RAW_POLLUTION, chunksize=1))
         
-        self.assertEqual(len(loaded), len(self.sample_water))
-        self.assertIn('county', loaded.columns)
+        self.assertEqual(len(chunks), len(self.sample_pollution))
+        self.assertEqual(sum(len(chunk) for chunk in chunks), len(self.sample_pollution))
         
-    def test_store_and_load_population_data(self):
-        """Test storing and loading population data"""
-        datasets = {
+    def test_create_indexes(self):
+        """Test composite county/year indexes are created on the raw tables"""
+        self.db_manager.store_datasets({
             TableNames.RAW_POLLUTION: self.sample_pollution,
             TableNames.RAW_WATER_QUALITY: self.sample_water,
             TableNames.RAW_POPULATION: self.sample_population
-        }
-        self.db_manager.store_datasets(datasets)
+        })
         
-        loaded = self.db_manager.load_dataset(TableNames.RAW_POPULATION)
+        self.db_manager.create_indexes()
         
-        self.assertEqual(len(loaded), len(self.sample_population))
-        self.assertIn('population', loaded.columns)
-        
-    def test_store_analysis_results(self):
-        """Test storing analysis results"""
-        results = {
-            'correlations': {'overall': pd.DataFrame({'A': [1, 2], 'B': [3, 4]})},
-            'statistics': {'descriptive': pd.DataFrame({'mean': [1.5], 'std': [0.5]})},
-            'trends': {'annual_means': pd.DataFrame({'year': [2022], 'value': [100]})},
-            'processed_data': {
-                'integrated': pd.DataFrame({'county': ['Cork'], 'year': [2022]})
-            }
-        }
-        
-        # Should not raise an error
-        self.db_manager.store_analysis_results(results)
+        indexes = pd.read_sql("SELECT name FROM sqlite_master WHERE type = 'index'", self.db_manager.engine)['name']
+        self.assertLessEqual({'idx_pollution_county_year', 'idx_population_county_year'}, set(indexes.unique()))
+
+    def test_create_indexes_drops_superseded_county_index(self):
+        """Test a single-column county index left by an older database is dropped"""
+        self.db_manager.store_datasets({
+            TableNames.RAW_POLLUTION: self.sample_pollution,
+            TableNames.RAW_WATER_QUALITY: self.sample_water,
+            TableNames.RAW_POPULATION: self.sample_population
+        })
+        with self.db_manager.engine.begin() as conn:
+            conn.exec_driver_sql("CREATE INDEX idx_pollution_county ON raw_pollution(county)")
+
+        self.db_manager.create_indexes()
+
+        indexes = pd.read_sql("SELECT name FROM sqlite_master WHERE type = 'index'", self.db_manager.engine)['name']
+        self.assertNotIn('idx_pollution_county', set(indexes))
+        self.assertIn('idx_pollution_county_year', set(indexes))
         
     def test_database_connection(self):
         """Test database connection is established"""
@@ -2,14 +2,30 @@
 Test fixtures and sample data generators for unit tests
 """
 
+import functools
 import pandas as pd
 from src.constants import WaterQualityColumns, PollutionColumns, PopulationColumns
 
 
+def _cached_frame(builder):
+    """Build the fixture frame once and hand each caller its own copy"""
+    frame = None
+
+    @functools.wraps(builder)
+    def wrapper():
+        nonlocal frame
+        if frame is None:
+            frame = builder()
+        return frame.copy()
+
+    return wrapper
+
+
 class TestDataGenerator:
     """Generates sample test data for unit tests"""
     
     @staticmethod
+    @_cached_frame
     def create_sample_pollution_data():
         """Create sample pollution data for testing"""
         return pd.DataFrame({
@@ -20,6 +36,7 @@ class TestDataGenerator:
         })
     
     @staticmethod
+    @_cached_frame
     def create_sample_water_quality_data():
         """Create sample water quality data for testing"""
         return pd.DataFrame({
@@ -30,6 +47,7 @@ class TestDataGenerator:
         })
     
     @staticmethod
+    @_cached_frame
     def create_sample_population_data():
         """Create sample population data for testing"""
         return pd.DataFrame({
@@ -39,6 +57,7 @@ class TestDataGenerator:
         })
     
     @staticmethod
+    @_cached_frame
     def create_national_pollution_data():
         """Create sample national-level pollution data for testing"""
         return pd.DataFrame({
@@ -50,6 +69,7 @@ class TestDataGenerator:
         })
     
     @staticmethod
+    @_cached_frame
     def create_detailed_water_quality_data():
         """Create detailed water quality data with site codes for testing"""
         return pd.DataFrame({
@@ -61,6 +81,7 @@ class TestDataGenerator:
         })
     
     @staticmethod
+    @_cached_frame
     def create_detailed_population_data():
         """Create detailed population data with census years for testing"""
         return pd.DataFrame({
@@ -72,6 +93,7 @@ class TestDataGenerator:
         })
     
     @staticmethod
+    @_cached_frame
     def create_integrated_dataset():
         """Create sample integrated dataset for dashboard testing"""
         return pd.DataFrame({
@@ -88,6 +110,7 @@ class TestDataGenerator:
         })
     
     @staticmethod
+    @_cached_frame
     def create_pollution_time_series():
         """Create sample pollution time series for trend analysis"""
         return pd.DataFrame({
@@ -98,6 +121,7 @@ class TestDataGenerator:
         })
     
     @staticmethod
+    @_cached_frame
     def create_correlation_matrix():
         """Create sample correlation matrix for testing"""
         return pd.DataFrame({
@@ -106,6 +130,7 @@ class TestDataGenerator:
         }, index=['pollution_index', 'avg_quality_score'])
     
     @staticmethod
+    @_cached_frame
     def create_population_with_emissions():
         """Create population data with estimated emissions for testing"""
         return pd.DataFrame({
@@ -116,6 +141,7 @@ class TestDataGenerator:
         })
     
     @staticmethod
+    @_cached_frame
     def create_minimal_integrated_dataset():
         """Create minimal integrated dataset for edge case testing"""
         return pd.DataFrame({
@@ -127,6 +153,7 @@ class TestDataGenerator:
         })
     
     @staticmethod
+    @_cached_frame
     def create_minimal_pollution_dataset():
         """Create minimal pollution dataset for edge case testing"""
         return pd.DataFrame({
@@ -137,6 +164,7 @@ class TestDataGenerator:
         })
     
     @staticmethod
+    @_cached_frame
     def create_empty_dataframe_with_column():
         """Create empty dataframe with at least one column to avoid SQL errors"""
         return pd.DataFrame({'dummy': []})
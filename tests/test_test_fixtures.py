@@ -6,72 +6,51 @@ import unittest
 import pandas as pd
 from tests.test_fixtures import TestDataGenerator
 
+# (generator, expected row count, required columns)
+_FIXTURE_SCHEMAS = (
+    (TestDataGenerator.create_sample_pollution_data, 2, {'county', 'year', 'pollutant', 'value'}),
+    (TestDataGenerator.create_sample_water_quality_data, 2, {'county', 'classification'}),
+    (TestDataGenerator.create_sample_population_data, 2, {'population'}),
+    (TestDataGenerator.create_national_pollution_data, 3, {'geographic_level'}),
+    (TestDataGenerator.create_integrated_dataset, 6,  # 3 counties * 2 years
+     {'pollution_index', 'avg_quality_score', 'estimated_county_emissions'}),
+    (TestDataGenerator.create_correlation_matrix, 2, {'pollution_index', 'avg_quality_score'}),
+    (TestDataGenerator.create_empty_dataframe_with_column, 0, {'dummy'}),
+)
+
 
 class TestTestDataGenerator(unittest.TestCase):
     """Test cases for TestDataGenerator fixture methods"""
     
-    def test_create_sample_pollution_data(self):
-        """Test sample pollution data generation"""
-        df = TestDataGenerator.create_sample_pollution_data()
-        
-        self.assertIsInstance(df, pd.DataFrame)
-        self.assertEqual(len(df), 2)
-        self.assertIn('county', df.columns)
-        self.assertIn('year', df.columns)
-        self.assertIn('pollutant', df.columns)
-        self.assertIn('value', df.columns)
-    
-    def test_create_sample_water_quality_data(self):
-        """Test sample water quality data generation"""
-        df = TestDataGenerator.create_sample_water_quality_data()
-        
-        self.assertIsInstance(df, pd.DataFrame)
-        self.assertEqual(len(df), 2)
-        self.assertIn('county', df.columns)
-        self.assertIn('classification', df.columns)
-    
-    def test_create_sample_population_data(self):
-        """Test sample population data generation"""
-        df = TestDataGenerator.create_sample_population_data()
-        
-        self.assertIsInstance(df, pd.DataFrame)
-        self.assertEqual(len(df), 2)
-        self.assertIn('population', df.columns)
+    def test_fixture_schemas(self):
+        """Test every generator returns a DataFrame with the expected length and columns"""
+        for factory, expected_len, expected_cols in _FIXTURE_SCHEMAS:
+            with self.subTest(factory=factory.__name__):
+                df = factory()
+                
+                self.assertIsInstance(df, pd.DataFrame)
+                self.assertEqual(len(df), expected_len)
+                self.assertLessEqual(expected_cols, set(df.columns))
     
     def test_create_national_pollution_data(self):
-        """Test national pollution data generation"""
+        """Test national pollution data is all at Ireland level"""
         df = TestDataGenerator.create_national_pollution_data()
         
-        self.assertIsInstance(df, pd.DataFrame)
-        self.assertEqual(len(df), 3)
         self.assertTrue(all(df['county'] == 'Ireland'))
-        self.assertIn('geographic_level', df.columns)
-    
-    def test_create_integrated_dataset(self):
-        """Test integrated dataset generation"""
-        df = TestDataGenerator.create_integrated_dataset()
-        
-        self.assertIsInstance(df, pd.DataFrame)
-        self.assertEqual(len(df), 6)  # 3 counties * 2 years
-        self.assertIn('pollution_index', df.columns)
-        self.assertIn('avg_quality_score', df.columns)
-        self.assertIn('estimated_county_emissions', df.columns)
     
     def test_create_correlation_matrix(self):
         """Test correlation matrix generation"""
         df = TestDataGenerator.create_correlation_matrix()
         
-        self.assertIsInstance(df, pd.DataFrame)
         self.assertEqual(df.shape, (2, 2))
         self.assertEqual(df.loc['pollution_index', 'pollution_index'], 1.0)
     
-    def test_create_empty_dataframe_with_column(self):
-        """Test empty dataframe generation"""
-        df = TestDataGenerator.create_empty_dataframe_with_column()
+    def test_generated_frames_are_independent_copies(self):
+        """Test mutating a generated frame does not leak into later calls"""
+        df = TestDataGenerator.create_sample_population_data()
+        df.loc[0, 'population'] = 0
         
-        self.assertIsInstance(df, pd.DataFrame)
-        self.assertEqual(len(df), 0)
-        self.assertIn('dummy', df.columns)
+        self.assertEqual(TestDataGenerator.create_sample_population_data().loc[0, 'population'], 500000)
 
 
 if __name__ == '__main__':